@@ -0,0 +1,25 @@
+"""Add user token_version
+
+Revision ID: 3f9d1c2b7a64
+Revises: cea232bba9aa
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9d1c2b7a64'
+down_revision = 'cea232bba9aa'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Embedded in access tokens; bumping it revokes every token issued before
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
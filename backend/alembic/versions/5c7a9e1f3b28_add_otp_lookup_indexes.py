@@ -0,0 +1,37 @@
+"""Add OTP lookup indexes
+
+Revision ID: 5c7a9e1f3b28
+Revises: 8b2e4f6a1d93
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c7a9e1f3b28'
+down_revision = '8b2e4f6a1d93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Partial indexes over unused codes match create_otp/verify_otp filters
+    op.create_index(
+        'ix_otps_user_id_purpose_code_unused', 'otps', ['user_id', 'purpose', 'code'], unique=False,
+        postgresql_where=sa.text('NOT is_used'),
+        sqlite_where=sa.text('is_used = 0'),
+    )
+    op.create_index(
+        'ix_otps_email_purpose_code_unused', 'otps', ['email', 'purpose', 'code'], unique=False,
+        postgresql_where=sa.text('NOT is_used'),
+        sqlite_where=sa.text('is_used = 0'),
+    )
+    op.create_index('ix_otps_expires_at', 'otps', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_otps_expires_at', table_name='otps')
+    op.drop_index('ix_otps_email_purpose_code_unused', table_name='otps')
+    op.drop_index('ix_otps_user_id_purpose_code_unused', table_name='otps')
@@ -0,0 +1,38 @@
+"""Add keyset pagination indexes
+
+Revision ID: cea232bba9aa
+Revises: make_user_id_nullable
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cea232bba9aa'
+down_revision = 'make_user_id_nullable'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Composite indexes ending in id so "WHERE user_id = :u AND id > :cursor
+    # ORDER BY id LIMIT n" is a single index range scan
+    op.create_index('ix_achievements_user_id_id', 'achievements', ['user_id', 'id'], unique=False)
+    op.create_index('ix_achievements_user_id_category_id_id', 'achievements', ['user_id', 'category_id', 'id'], unique=False)
+    op.create_index(
+        'ix_achievements_public_id', 'achievements', ['id'], unique=False,
+        postgresql_where=sa.text('is_public'),
+        sqlite_where=sa.text('is_public'),
+    )
+    op.create_index('ix_goals_user_id_id', 'goals', ['user_id', 'id'], unique=False)
+    op.create_index('ix_skills_user_id_id', 'skills', ['user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_skills_user_id_id', table_name='skills')
+    op.drop_index('ix_goals_user_id_id', table_name='goals')
+    op.drop_index('ix_achievements_public_id', table_name='achievements')
+    op.drop_index('ix_achievements_user_id_category_id_id', table_name='achievements')
+    op.drop_index('ix_achievements_user_id_id', table_name='achievements')
@@ -0,0 +1,38 @@
+"""Add daily_user_stats rollup and users.created_at index
+
+Revision ID: e2b7c5d9a413
+Revises: 9d4f2a6c8e17
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b7c5d9a413'
+down_revision = '9d4f2a6c8e17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filled lazily by the growth endpoint on first use
+    op.create_table('daily_user_stats',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('new_users', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_daily_user_stats_id'), 'daily_user_stats', ['id'], unique=False)
+    op.create_index(op.f('ix_daily_user_stats_day'), 'daily_user_stats', ['day'], unique=True)
+    op.create_index('ix_users_created_at', 'users', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_created_at', table_name='users')
+    op.drop_index(op.f('ix_daily_user_stats_day'), table_name='daily_user_stats')
+    op.drop_index(op.f('ix_daily_user_stats_id'), table_name='daily_user_stats')
+    op.drop_table('daily_user_stats')
@@ -1,59 +1,178 @@
-from typing import Generator
+import math
+from typing import Any, Generator, NoReturn
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.db.base import get_db
+from app.core.quotas import check_request_rate, tier_limits, usage_counters
+from app.core.token_cache import token_cache
+from app.core.user_cache import UserPrincipal, user_cache
+from app.db.base import get_async_db, get_db
+from app.db.routing import current_user_id
 from app.models.user import User
 from app.crud.crud_user import user as crud_user
 from app.schemas.token import TokenPayload
+from app.services.system_stats import system_stats
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
-    """
-    Dependency to get current authenticated user from JWT token.
-    """
-    credentials_exception = HTTPException(
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def decode_token(token: str) -> TokenPayload:
+    """
+    Verify an access token and return its payload.
+    Verified payloads are cached by token digest until they expire, so a
+    client resending the same token skips the signature check.
+    """
+    token_data = token_cache.get(token)
+    if token_data is not None:
+        return token_data
     
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
         token_data = TokenPayload(**payload)
-        
-        if token_data.sub is None:
-            raise credentials_exception
-            
     except (JWTError, ValidationError):
-        raise credentials_exception
+        raise credentials_exception()
     
-    user = crud_user.get(db, id=token_data.sub)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    # Refresh tokens are only accepted by /auth/refresh
+    if token_data.sub is None or token_data.typ is not None:
+        raise credentials_exception()
     
-    return user
+    if payload.get("exp") is not None:
+        token_cache.set(token, token_data, float(payload["exp"]))
+    return token_data
 
 
-def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+async def get_current_user(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme)
+) -> UserPrincipal:
+    """
+    Dependency to get current authenticated user from JWT token.
+    Authorises from the token's claims; the only per-request lookup is a
+    cached token-version check. Load the full row with crud_user.aget when
+    an endpoint needs more than the principal.
+    """
+    token_data = decode_token(token)
+    
+    # Lets the routing session keep this user's reads on the primary
+    # right after they write
+    current_user_id.set(token_data.sub)
+
+    # Current token version from the cache, else a slim column load
+    cached = user_cache.get(token_data.sub)
+    if cached is None:
+        cached = await crud_user.aget_principal(db, id=token_data.sub)
+        if not cached:
+            raise HTTPException(status_code=404, detail="User not found")
+        user_cache.set(cached)
+    
+    # Tokens issued before the last ban/demotion/password reset are revoked;
+    # tokens without claims predate versioning and count as version 0
+    if (token_data.ver or 0) != cached.token_version:
+        raise credentials_exception()
+    
+    if token_data.ver is None:
+        return cached
+    
+    return UserPrincipal(
+        id=token_data.sub,
+        is_active=bool(token_data.active),
+        is_superuser=bool(token_data.admin),
+        subscription_tier=token_data.tier or "free",
+        token_version=token_data.ver,
+    )
+
+
+async def get_current_active_user(
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> UserPrincipal:
     """
     Dependency to get current active user.
     """
     if not crud_user.is_active(current_user):
         raise HTTPException(status_code=400, detail="Inactive user")
     
+    retry_after = await check_request_rate(current_user.id, current_user.subscription_tier)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Request quota exceeded for your plan",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+    
     return current_user
+
+
+async def get_current_active_user_record(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> User:
+    """
+    Dependency to load the full user row for the current user.
+    Only for endpoints that read or modify profile fields.
+    """
+    user = await crud_user.aget(db, id=current_user.id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    return user
+
+
+def check_batch_size(count: int) -> None:
+    """
+    Reject batch requests larger than MAX_BATCH_SIZE items.
+    """
+    if count > settings.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch size exceeds the limit of {settings.MAX_BATCH_SIZE} items",
+        )
+
+
+async def check_quota(
+    db: AsyncSession, current_user: UserPrincipal, model: Any, adding: int = 1
+) -> None:
+    """
+    Reject creates that would take the user past their tier's row limit.
+    Record committed creates/deletes with record_usage.
+    """
+    limit = tier_limits(current_user.subscription_tier)[model.__tablename__]
+    if limit <= 0:
+        return
+    
+    count = await usage_counters.aget(db, user_id=current_user.id, model=model)
+    if count + adding > limit:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Your plan allows up to {limit} {model.__tablename__}",
+        )
+
+
+def record_usage(*, user_id: int, model: Any, delta: int) -> None:
+    """Apply a committed create (+n) or delete (-n) to the usage and system counters"""
+    usage_counters.adjust(user_id=user_id, model=model, delta=delta)
+    system_stats.record_content(model, delta)
+
+
+async def raise_not_owned(crud: Any, db: AsyncSession, *, id: int, name: str) -> NoReturn:
+    """
+    Raise 403 if the record exists but belongs to someone else, 404 otherwise.
+    Only called after an ownership-scoped statement matched nothing.
+    """
+    if await crud.aexists(db, id=id):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    raise HTTPException(status_code=404, detail=f"{name} not found")
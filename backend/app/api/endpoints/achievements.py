@@ -1,65 +1,141 @@
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_active_user, get_db
+from app.api.deps import (
+    check_batch_size,
+    check_quota,
+    get_current_active_user,
+    get_async_db,
+    raise_not_owned,
+    record_usage,
+)
+from app.api.pagination import decode_cursor, set_next_cursor
 from app.crud.crud_achievement import achievement as crud_achievement
-from app.models.user import User
-from app.schemas.achievement import Achievement, AchievementCreate, AchievementUpdate
+from app.core.user_cache import UserPrincipal
+from app.schemas.achievement import (
+    Achievement,
+    AchievementBatchUpdate,
+    AchievementCreate,
+    AchievementUpdate,
+)
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[Achievement])
-def read_achievements(
-    db: Session = Depends(get_db),
+async def read_achievements(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     category_id: Optional[int] = Query(None),
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Retrieve achievements for the current user.
+    Pass the X-Next-Cursor header back as ``cursor`` to fetch the next page.
     """
-    achievements = crud_achievement.get_multi_by_user(
+    achievements = await crud_achievement.aget_multi_by_user(
         db=db, 
         user_id=current_user.id, 
         skip=skip, 
         limit=limit,
-        category_id=category_id
+        category_id=category_id,
+        after_id=decode_cursor(cursor)
     )
+    set_next_cursor(response, achievements, limit)
     return achievements
 
 
 @router.post("/", response_model=Achievement, status_code=201)
-def create_achievement(
+async def create_achievement(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     achievement_in: AchievementCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Create new achievement for current user.
     """
-    achievement = crud_achievement.create_with_user(
+    await check_quota(db, current_user, crud_achievement.model)
+    achievement = await crud_achievement.acreate_with_user(
         db=db, 
         obj_in=achievement_in, 
         user_id=current_user.id
     )
+    record_usage(user_id=current_user.id, model=crud_achievement.model, delta=1)
     return achievement
 
 
+@router.post("/batch", response_model=List[Achievement], status_code=201)
+async def create_achievements_batch(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    achievements_in: List[AchievementCreate],
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> Any:
+    """
+    Create many achievements for current user in a single transaction.
+    """
+    check_batch_size(len(achievements_in))
+    await check_quota(db, current_user, crud_achievement.model, len(achievements_in))
+    achievements = await crud_achievement.acreate_multi(
+        db=db, objs_in=achievements_in, user_id=current_user.id
+    )
+    record_usage(user_id=current_user.id, model=crud_achievement.model, delta=len(achievements))
+    return achievements
+
+
+@router.put("/batch", response_model=List[Achievement])
+async def update_achievements_batch(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    achievements_in: List[AchievementBatchUpdate],
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> Any:
+    """
+    Update many achievements in a single transaction.
+    Items that do not exist or belong to another user are skipped.
+    """
+    check_batch_size(len(achievements_in))
+    achievements = await crud_achievement.aupdate_multi(
+        db=db, objs_in=achievements_in, user_id=current_user.id
+    )
+    return achievements
+
+
+@router.delete("/batch", response_model=List[Achievement])
+async def delete_achievements_batch(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    ids: List[int] = Query(...),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> Any:
+    """
+    Delete many achievements in a single statement.
+    Ids that do not exist or belong to another user are skipped.
+    """
+    check_batch_size(len(ids))
+    achievements = await crud_achievement.aremove_multi(
+        db=db, ids=ids, user_id=current_user.id
+    )
+    record_usage(user_id=current_user.id, model=crud_achievement.model, delta=-len(achievements))
+    return achievements
+
+
 @router.get("/{achievement_id}", response_model=Achievement)
-def read_achievement(
+async def read_achievement(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     achievement_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Get achievement by ID.
     """
-    achievement = crud_achievement.get(db=db, id=achievement_id)
+    achievement = await crud_achievement.aget(db=db, id=achievement_id)
     if not achievement:
         raise HTTPException(status_code=404, detail="Achievement not found")
     
@@ -71,64 +147,59 @@ def read_achievement(
 
 
 @router.put("/{achievement_id}", response_model=Achievement)
-def update_achievement(
+async def update_achievement(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     achievement_id: int,
     achievement_in: AchievementUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Update an achievement.
     """
-    achievement = crud_achievement.get(db=db, id=achievement_id)
-    if not achievement:
-        raise HTTPException(status_code=404, detail="Achievement not found")
-    
-    # Check if user owns this achievement
-    if achievement.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-    
-    achievement = crud_achievement.update(
+    achievement = await crud_achievement.aupdate_owned(
         db=db, 
-        db_obj=achievement, 
+        id=achievement_id, 
+        user_id=current_user.id, 
         obj_in=achievement_in
     )
+    if not achievement:
+        await raise_not_owned(crud_achievement, db, id=achievement_id, name="Achievement")
     return achievement
 
 
 @router.delete("/{achievement_id}", response_model=Achievement)
-def delete_achievement(
+async def delete_achievement(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     achievement_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Delete an achievement.
     """
-    achievement = crud_achievement.get(db=db, id=achievement_id)
+    achievement = await crud_achievement.adelete_owned(
+        db=db, id=achievement_id, user_id=current_user.id
+    )
     if not achievement:
-        raise HTTPException(status_code=404, detail="Achievement not found")
-    
-    # Check if user owns this achievement
-    if achievement.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-    
-    achievement = crud_achievement.remove(db=db, id=achievement_id)
+        await raise_not_owned(crud_achievement, db, id=achievement_id, name="Achievement")
+    record_usage(user_id=current_user.id, model=crud_achievement.model, delta=-1)
     return achievement
 
 
 @router.get("/public/all", response_model=List[Achievement])
-def read_public_achievements(
-    db: Session = Depends(get_db),
+async def read_public_achievements(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> Any:
     """
     Retrieve all public achievements (no authentication required).
     """
-    achievements = crud_achievement.get_public_achievements(
-        db=db, skip=skip, limit=limit
+    achievements = await crud_achievement.aget_public_achievements(
+        db=db, skip=skip, limit=limit, after_id=decode_cursor(cursor)
     )
+    set_next_cursor(response, achievements, limit)
     return achievements
@@ -1,29 +1,37 @@
-from datetime import datetime, timedelta
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
 
 from app.api.deps import get_current_active_user, get_db
+from app.api.pagination import decode_cursor, set_next_cursor
+from app.db.pool_metrics import get_pool_stats
+from app.core.password_hasher import password_hasher
+from app.core.user_cache import UserPrincipal, user_cache
 from app.models.user import User
-from app.models.achievement import Achievement
-from app.models.skill import Skill
-from app.models.goal import Goal
 from app.schemas.admin import (
     UserAdmin,
     UserAdminUpdate,
+    UserSuggestion,
     SystemStats,
+    PoolStats,
+    UserCacheStats,
+    PasswordHasherStats,
     GrowthDataPoint,
     ActivityLog
 )
-from app.crud.crud_user import user as crud_user
+from app.crud.crud_achievement import achievement as crud_achievement
+from app.crud.crud_user import UserWithCounts, user as crud_user
+from app.services.growth_stats import growth_stats
+from app.services.system_stats import system_stats
+from app.services.user_search import user_search
 
 router = APIRouter()
 
 
 def get_current_admin(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+    current_user: UserPrincipal = Depends(get_current_active_user)
+) -> UserPrincipal:
     """Verify that the current user is an admin"""
     if not current_user.is_superuser:
         raise HTTPException(
@@ -37,92 +45,90 @@ def get_current_admin(
 # USER MANAGEMENT
 # ============================================================
 
+def _user_admin(row: UserWithCounts) -> UserAdmin:
+    user, achievement_count, skill_count, goal_count = row
+    return UserAdmin.model_validate(user).model_copy(update={
+        "achievement_count": achievement_count,
+        "skill_count": skill_count,
+        "goal_count": goal_count,
+    })
+
+
 @router.get("/users", response_model=List[UserAdmin])
 def list_users(
     *,
+    response: Response,
     db: Session = Depends(get_db),
-    admin: User = Depends(get_current_admin),
+    admin: UserPrincipal = Depends(get_current_admin),
     skip: int = 0,
     limit: int = 100,
-    search: Optional[str] = None
+    cursor: Optional[str] = None,
+    search: Optional[str] = Query(default=None, min_length=1, pattern=r"\S")
 ) -> Any:
     """
-    Get list of all users (admin only)
+    Get list of all users (admin only).
+    With ``search``, matches on email or name are ranked best first and
+    paged with ``skip``; cursors apply to the unfiltered, id-ordered list.
     """
-    query = db.query(User)
-    
-    # Search filter
     if search:
-        search_filter = f"%{search}%"
-        query = query.filter(
-            (User.email.ilike(search_filter)) | 
-            (User.full_name.ilike(search_filter))
-        )
-    
-    users = query.offset(skip).limit(limit).all()
-    
-    # Add stats to each user
-    user_list = []
-    for user in users:
-        user_dict = {
-            "id": user.id,
-            "email": user.email,
-            "full_name": user.full_name,
-            "is_active": user.is_active,
-            "is_superuser": user.is_superuser,
-            "subscription_tier": user.subscription_tier,
-            "is_email_verified": user.is_email_verified,
-            "is_phone_verified": user.is_phone_verified,
-            "created_at": user.created_at,
-            "updated_at": user.updated_at,
-            "achievement_count": len(user.achievements),
-            "skill_count": len(user.skills),
-            "goal_count": len(user.goals)
-        }
-        user_list.append(UserAdmin(**user_dict))
+        ids = user_search.search(db, search, skip=skip, limit=limit)
+        return [_user_admin(row) for row in crud_user.get_many_with_counts(db, ids=ids)]
     
-    return user_list
+    rows = crud_user.get_multi_with_counts(
+        db, skip=skip, limit=limit, after_id=decode_cursor(cursor)
+    )
+    set_next_cursor(response, [row[0] for row in rows], limit)
+    return [_user_admin(row) for row in rows]
+
+
+@router.get("/users/autocomplete", response_model=List[UserSuggestion])
+def autocomplete_users(
+    *,
+    db: Session = Depends(get_db),
+    admin: UserPrincipal = Depends(get_current_admin),
+    q: str = Query(min_length=1, pattern=r"\S"),
+    limit: int = Query(default=10, le=50)
+) -> Any:
+    """
+    Suggest users whose email, name or a word of their name starts with ``q`` (admin only)
+    """
+    ids = user_search.autocomplete(db, q, limit=limit)
+    if not ids:
+        return []
+    users = {
+        row.id: row
+        for row in db.execute(
+            select(User.id, User.email, User.full_name).where(User.id.in_(ids))
+        ).all()
+    }
+    return [UserSuggestion.model_validate(users[id]) for id in ids if id in users]
 
 
 @router.get("/users/{user_id}", response_model=UserAdmin)
 def get_user_details(
     *,
     db: Session = Depends(get_db),
-    admin: User = Depends(get_current_admin),
+    admin: UserPrincipal = Depends(get_current_admin),
     user_id: int
 ) -> Any:
     """
     Get detailed user information (admin only)
     """
-    user = crud_user.get(db, id=user_id)
-    if not user:
+    row = crud_user.get_with_counts(db, id=user_id)
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    return UserAdmin(
-        id=user.id,
-        email=user.email,
-        full_name=user.full_name,
-        is_active=user.is_active,
-        is_superuser=user.is_superuser,
-        subscription_tier=user.subscription_tier,
-        is_email_verified=user.is_email_verified,
-        is_phone_verified=user.is_phone_verified,
-        created_at=user.created_at,
-        updated_at=user.updated_at,
-        achievement_count=len(user.achievements),
-        skill_count=len(user.skills),
-        goal_count=len(user.goals)
-    )
+    return _user_admin(row)
 
 
 @router.put("/users/{user_id}", response_model=UserAdmin)
 def update_user(
     *,
     db: Session = Depends(get_db),
-    admin: User = Depends(get_current_admin),
+    admin: UserPrincipal = Depends(get_current_admin),
     user_id: int,
     user_update: UserAdminUpdate
 ) -> Any:
@@ -136,36 +142,17 @@ def update_user(
             detail="User not found"
         )
     
-    # Update fields
-    update_data = user_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(user, field, value)
-    
-    db.commit()
-    db.refresh(user)
+    # Update only the fields that changed
+    crud_user.update(db, db_obj=user, obj_in=user_update.model_dump(exclude_unset=True))
     
-    return UserAdmin(
-        id=user.id,
-        email=user.email,
-        full_name=user.full_name,
-        is_active=user.is_active,
-        is_superuser=user.is_superuser,
-        subscription_tier=user.subscription_tier,
-        is_email_verified=user.is_email_verified,
-        is_phone_verified=user.is_phone_verified,
-        created_at=user.created_at,
-        updated_at=user.updated_at,
-        achievement_count=len(user.achievements),
-        skill_count=len(user.skills),
-        goal_count=len(user.goals)
-    )
+    return _user_admin(crud_user.get_with_counts(db, id=user_id))
 
 
 @router.delete("/users/{user_id}")
 def delete_user(
     *,
     db: Session = Depends(get_db),
-    admin: User = Depends(get_current_admin),
+    admin: UserPrincipal = Depends(get_current_admin),
     user_id: int
 ) -> Any:
     """
@@ -197,78 +184,58 @@ def delete_user(
 def get_system_stats(
     *,
     db: Session = Depends(get_db),
-    admin: User = Depends(get_current_admin)
+    admin: UserPrincipal = Depends(get_current_admin)
 ) -> Any:
     """
-    Get overall system statistics (admin only)
+    Get overall system statistics (admin only), cached for a few seconds
     """
-    total_users = db.query(func.count(User.id)).scalar()
-    active_users = db.query(func.count(User.id)).filter(User.is_active == True).scalar()
-    verified_users = db.query(func.count(User.id)).filter(User.is_email_verified == True).scalar()
-    pro_users = db.query(func.count(User.id)).filter(User.subscription_tier == "pro").scalar()
-    
-    total_achievements = db.query(func.count(Achievement.id)).scalar()
-    total_skills = db.query(func.count(Skill.id)).scalar()
-    total_goals = db.query(func.count(Goal.id)).scalar()
-    
-    # Users created today
-    today = datetime.utcnow().date()
-    users_created_today = db.query(func.count(User.id)).filter(
-        func.date(User.created_at) == today
-    ).scalar()
-    
-    return SystemStats(
-        total_users=total_users or 0,
-        active_users=active_users or 0,
-        verified_users=verified_users or 0,
-        pro_users=pro_users or 0,
-        total_achievements=total_achievements or 0,
-        total_skills=total_skills or 0,
-        total_goals=total_goals or 0,
-        users_created_today=users_created_today or 0
-    )
+    return SystemStats(**system_stats.get(db))
+
+
+@router.get("/stats/pool", response_model=List[PoolStats])
+def get_pool_metrics(
+    *,
+    admin: UserPrincipal = Depends(get_current_admin)
+) -> Any:
+    """
+    Get database connection pool metrics for each engine (admin only)
+    """
+    return [PoolStats(**stats) for stats in get_pool_stats().values()]
+
+
+@router.get("/stats/user-cache", response_model=UserCacheStats)
+def get_user_cache_stats(
+    *,
+    admin: UserPrincipal = Depends(get_current_admin)
+) -> Any:
+    """
+    Get authenticated-user cache hit/miss counters for this process (admin only)
+    """
+    return UserCacheStats(**user_cache.stats())
+
+
+@router.get("/stats/password-hasher", response_model=PasswordHasherStats)
+def get_password_hasher_stats(
+    *,
+    admin: UserPrincipal = Depends(get_current_admin)
+) -> Any:
+    """
+    Get password-hashing pool queue depth and wait times for this process (admin only)
+    """
+    return PasswordHasherStats(**password_hasher.stats())
 
 
 @router.get("/stats/growth", response_model=List[GrowthDataPoint])
 def get_growth_data(
     *,
     db: Session = Depends(get_db),
-    admin: User = Depends(get_current_admin),
+    admin: UserPrincipal = Depends(get_current_admin),
     days: int = Query(default=30, le=365)
 ) -> Any:
     """
     Get user growth data for charts (admin only)
     """
-    end_date = datetime.utcnow().date()
-    start_date = end_date - timedelta(days=days)
-    
-    # Get all users within date range
-    users = db.query(User).filter(
-        User.created_at >= start_date
-    ).order_by(User.created_at).all()
-    
-    # Group by date
-    growth_data = {}
-    current_date = start_date
-    total_users_before = db.query(func.count(User.id)).filter(
-        User.created_at < start_date
-    ).scalar() or 0
-    
-    running_total = total_users_before
-    
-    while current_date <= end_date:
-        date_str = current_date.strftime("%Y-%m-%d")
-        new_users_count = sum(1 for u in users if u.created_at.date() == current_date)
-        running_total += new_users_count
-        
-        growth_data[date_str] = {
-            "date": date_str,
-            "new_users": new_users_count,
-            "total_users": running_total
-        }
-        current_date += timedelta(days=1)
-    
-    return [GrowthDataPoint(**data) for data in growth_data.values()]
+    return [GrowthDataPoint(**data) for data in growth_stats.series(db, days=days)]
 
 
 # ============================================================
@@ -278,15 +245,20 @@ def get_growth_data(
 @router.get("/achievements")
 def list_all_achievements(
     *,
+    response: Response,
     db: Session = Depends(get_db),
-    admin: User = Depends(get_current_admin),
+    admin: UserPrincipal = Depends(get_current_admin),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ) -> Any:
     """
     Get all achievements (public + private) for moderation (admin only)
     """
-    achievements = db.query(Achievement).offset(skip).limit(limit).all()
+    achievements = crud_achievement.get_multi(
+        db, skip=skip, limit=limit, after_id=decode_cursor(cursor)
+    )
+    set_next_cursor(response, achievements, limit)
     
     result = []
     for ach in achievements:
@@ -1,15 +1,14 @@
-from datetime import timedelta
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_active_user, get_db
-from app.core.config import settings
-from app.core.security import create_access_token
+from app.api.deps import get_current_active_user_record, get_async_db, get_db
 from app.crud.crud_user import user as crud_user
 from app.models.user import User
-from app.schemas.token import Token
+from app.schemas.token import RefreshTokenRequest, Token
+from app.services.token_service import token_service
 from app.schemas.user import User as UserSchema, UserCreate
 
 router = APIRouter()
@@ -52,16 +51,16 @@ def register_request_otp(
 
 
 @router.post("/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
-def register(
+async def register(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_in: UserCreate,
 ) -> Any:
     """
     Register new user - Direct registration without OTP verification
     """
     # Check if user already exists
-    user = crud_user.get_by_email(db, email=user_in.email)
+    user = await crud_user.aget_by_email(db, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
@@ -69,22 +68,22 @@ def register(
         )
     
     # Create user directly
-    user = crud_user.create(db, obj_in=user_in)
+    user = await crud_user.acreate(db, obj_in=user_in)
     
     return user
 
 
 
 @router.post("/login", response_model=Token)
-def login(
-    db: Session = Depends(get_db),
+async def login(
+    db: AsyncSession = Depends(get_async_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests.
     """
     # Authenticate user
-    user = crud_user.authenticate(
+    user = await crud_user.aauthenticate(
         db, email=form_data.username, password=form_data.password
     )
     if not user:
@@ -98,21 +97,47 @@ def login(
             detail="Inactive user"
         )
     
-    # Create access token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        subject=user.id, expires_delta=access_token_expires
-    )
+    # Create access and refresh tokens
+    return token_service.issue_tokens(user)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_token(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    body: RefreshTokenRequest,
+) -> Any:
+    """
+    Exchange a refresh token for a new access/refresh pair.
+    The presented refresh token is revoked (rotation).
+    """
+    tokens = await token_service.arotate(db, body.refresh_token)
+    if tokens is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     
-    return {
-        "access_token": access_token,
-        "token_type": "bearer"
-    }
+    return tokens
+
+
+@router.post("/logout", response_model=dict)
+async def logout(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    body: RefreshTokenRequest,
+) -> Any:
+    """
+    Revoke a refresh token.
+    """
+    await token_service.arevoke(db, body.refresh_token)
+    return {"message": "Logged out"}
 
 
 @router.get("/me", response_model=UserSchema)
-def read_users_me(
-    current_user: User = Depends(get_current_active_user),
+async def read_users_me(
+    current_user: User = Depends(get_current_active_user_record),
 ) -> Any:
     """
     Get current user information.
@@ -121,33 +146,36 @@ def read_users_me(
 
 
 @router.put("/me", response_model=UserSchema)
-def update_user_me(
+async def update_user_me(
     *,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user_record),
     user_in: dict,
 ) -> Any:
     """
     Update current user profile.
     """
     # Update user profile
-    user = crud_user.update(db, db_obj=current_user, obj_in=user_in)
+    user = await crud_user.aupdate(db, db_obj=current_user, obj_in=user_in)
     return user
 
 
 @router.post("/change-password", response_model=dict)
-def change_password(
+async def change_password(
     *,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user_record),
     current_password: str,
     new_password: str,
 ) -> Any:
     """
     Change user password.
     """
-    # Verify current password
-    if not crud_user.authenticate(db, email=current_user.email, password=current_password):
+    # Verify current password against the row already loaded; no rehash
+    # since the hash is replaced below
+    if not await crud_user.acheck_password(
+        db, user=current_user, password=current_password, rehash=False
+    ):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect password"
@@ -156,9 +184,13 @@ def change_password(
     # Update password
     from app.schemas.user import UserUpdate
     user_update = UserUpdate(password=new_password)
-    crud_user.update(db, db_obj=current_user, obj_in=user_update)
+    user = await crud_user.aupdate(db, db_obj=current_user, obj_in=user_update)
     
-    return {"message": "Password updated successfully"}
+    # The password change revoked existing tokens; hand back fresh ones
+    return {
+        "message": "Password updated successfully",
+        **token_service.issue_tokens(user),
+    }
 
 
 @router.post("/forgot-password", response_model=dict)
@@ -181,7 +213,7 @@ def forgot_password(
     
     # Generate and send OTP
     otp = otp_service.create_otp(db, user_id=user.id, purpose="password_reset")
-    email_service.send_otp_email(to_email=user.email, otp_code=otp.code, user_name=user.full_name)
+    email_service.send_otp_email(to_email=user.email, otp_code=otp.code, user_name=user.full_name, db=db)
     
     return {"message": "If the email exists, an OTP has been sent"}
 
@@ -245,7 +277,7 @@ def reset_password(
     crud_user.update(db, db_obj=user, obj_in=user_update)
     
     # Send confirmation email
-    email_service.send_password_reset_confirmation(to_email=user.email, user_name=user.full_name)
+    email_service.send_password_reset_confirmation(to_email=user.email, user_name=user.full_name, db=db)
     
     return {"message": "Password reset successfully"}
 
@@ -1,8 +1,9 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db
+from app.api.deps import get_async_db
+from app.api.pagination import decode_cursor, set_next_cursor
 from app.crud.base import CRUDBase
 from app.models.category import Category
 from app.schemas.category import Category as CategorySchema, CategoryCreate, CategoryUpdate
@@ -14,41 +15,46 @@ crud_category = CRUDBase[Category, CategoryCreate, CategoryUpdate](Category)
 
 
 @router.get("/", response_model=List[CategorySchema])
-def read_categories(
-    db: Session = Depends(get_db),
+async def read_categories(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> Any:
     """
     Retrieve all categories.
     """
-    categories = crud_category.get_multi(db, skip=skip, limit=limit)
+    categories = await crud_category.aget_multi(
+        db, skip=skip, limit=limit, after_id=decode_cursor(cursor)
+    )
+    set_next_cursor(response, categories, limit)
     return categories
 
 
 @router.post("/", response_model=CategorySchema, status_code=201)
-def create_category(
+async def create_category(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     category_in: CategoryCreate,
 ) -> Any:
     """
     Create new category.
     """
-    category = crud_category.create(db=db, obj_in=category_in)
+    category = await crud_category.acreate(db=db, obj_in=category_in)
     return category
 
 
 @router.get("/{category_id}", response_model=CategorySchema)
-def read_category(
+async def read_category(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     category_id: int,
 ) -> Any:
     """
     Get category by ID.
     """
-    category = crud_category.get(db=db, id=category_id)
+    category = await crud_category.aget(db=db, id=category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     return category
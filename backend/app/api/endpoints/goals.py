@@ -1,12 +1,20 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_active_user, get_db
+from app.api.deps import (
+    check_batch_size,
+    check_quota,
+    get_current_active_user,
+    get_async_db,
+    raise_not_owned,
+    record_usage,
+)
+from app.api.pagination import decode_cursor, set_next_cursor
 from app.crud.base import CRUDBase
-from app.models.user import User
+from app.core.user_cache import UserPrincipal
 from app.models.goal import Goal
-from app.schemas.goal import Goal as GoalSchema, GoalCreate, GoalUpdate
+from app.schemas.goal import Goal as GoalSchema, GoalBatchUpdate, GoalCreate, GoalUpdate
 
 router = APIRouter()
 
@@ -15,75 +23,136 @@ crud_goal = CRUDBase[Goal, GoalCreate, GoalUpdate](Goal)
 
 
 @router.get("/", response_model=List[GoalSchema])
-def read_goals(
-    db: Session = Depends(get_db),
+async def read_goals(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Retrieve goals for current user.
     """
-    goals = db.query(Goal).filter(Goal.user_id == current_user.id).offset(skip).limit(limit).all()
+    goals = await crud_goal.aget_multi_by_user(
+        db,
+        user_id=current_user.id,
+        skip=skip,
+        limit=limit,
+        after_id=decode_cursor(cursor)
+    )
+    set_next_cursor(response, goals, limit)
     return goals
 
 
 @router.post("/", response_model=GoalSchema, status_code=201)
-def create_goal(
+async def create_goal(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     goal_in: GoalCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Create new goal for current user.
     """
-    goal_data = goal_in.dict()
-    goal = Goal(**goal_data, user_id=current_user.id)
-    db.add(goal)
-    db.commit()
-    db.refresh(goal)
+    await check_quota(db, current_user, crud_goal.model)
+    goal = await crud_goal.acreate_with_user(
+        db=db, obj_in=goal_in, user_id=current_user.id
+    )
+    record_usage(user_id=current_user.id, model=crud_goal.model, delta=1)
     return goal
 
 
+@router.post("/batch", response_model=List[GoalSchema], status_code=201)
+async def create_goals_batch(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    goals_in: List[GoalCreate],
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> Any:
+    """
+    Create many goals for current user in a single transaction.
+    """
+    check_batch_size(len(goals_in))
+    await check_quota(db, current_user, crud_goal.model, len(goals_in))
+    goals = await crud_goal.acreate_multi(
+        db=db, objs_in=goals_in, user_id=current_user.id
+    )
+    record_usage(user_id=current_user.id, model=crud_goal.model, delta=len(goals))
+    return goals
+
+
+@router.put("/batch", response_model=List[GoalSchema])
+async def update_goals_batch(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    goals_in: List[GoalBatchUpdate],
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> Any:
+    """
+    Update many goals in a single transaction.
+    Items that do not exist or belong to another user are skipped.
+    """
+    check_batch_size(len(goals_in))
+    goals = await crud_goal.aupdate_multi(
+        db=db, objs_in=goals_in, user_id=current_user.id
+    )
+    return goals
+
+
+@router.delete("/batch", response_model=List[GoalSchema])
+async def delete_goals_batch(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    ids: List[int] = Query(...),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> Any:
+    """
+    Delete many goals in a single statement.
+    Ids that do not exist or belong to another user are skipped.
+    """
+    check_batch_size(len(ids))
+    goals = await crud_goal.aremove_multi(
+        db=db, ids=ids, user_id=current_user.id
+    )
+    record_usage(user_id=current_user.id, model=crud_goal.model, delta=-len(goals))
+    return goals
+
+
 @router.put("/{goal_id}", response_model=GoalSchema)
-def update_goal(
+async def update_goal(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     goal_id: int,
     goal_in: GoalUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Update a goal.
     """
-    goal = crud_goal.get(db=db, id=goal_id)
+    goal = await crud_goal.aupdate_owned(
+        db=db, 
+        id=goal_id, 
+        user_id=current_user.id, 
+        obj_in=goal_in
+    )
     if not goal:
-        raise HTTPException(status_code=404, detail="Goal not found")
-    
-    if goal.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-    
-    goal = crud_goal.update(db=db, db_obj=goal, obj_in=goal_in)
+        await raise_not_owned(crud_goal, db, id=goal_id, name="Goal")
     return goal
 
 
 @router.delete("/{goal_id}", response_model=GoalSchema)
-def delete_goal(
+async def delete_goal(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     goal_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Delete a goal.
     """
-    goal = crud_goal.get(db=db, id=goal_id)
+    goal = await crud_goal.adelete_owned(db=db, id=goal_id, user_id=current_user.id)
     if not goal:
-        raise HTTPException(status_code=404, detail="Goal not found")
-    
-    if goal.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-    
-    goal = crud_goal.remove(db=db, id=goal_id)
+        await raise_not_owned(crud_goal, db, id=goal_id, name="Goal")
+    record_usage(user_id=current_user.id, model=crud_goal.model, delta=-1)
     return goal
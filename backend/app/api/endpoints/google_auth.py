@@ -1,22 +1,21 @@
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.requests import Request
 from starlette.responses import RedirectResponse
 
-from app.api.deps import get_db
+from app.api.deps import get_async_db
 from app.core.config import settings
-from app.core.security import create_access_token
 from app.crud.crud_user import user as crud_user
-from app.schemas.user import UserCreate
 from app.schemas.token import Token
-from datetime import timedelta
+from app.services.google_oauth import google_oauth
+from app.services.token_service import token_service
 import httpx
 
 router = APIRouter()
 
 
-
 @router.get("/google/login")
 async def google_login(request: Request):
     """
@@ -45,7 +44,7 @@ async def google_login(request: Request):
 @router.get("/google/callback", response_model=Token)
 async def google_callback(
     code: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Handle Google OAuth callback and create/login user
@@ -57,78 +56,42 @@ async def google_callback(
         )
     
     try:
-        # Exchange code for token
-        token_url = "https://oauth2.googleapis.com/token"
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                token_url,
-                data={
-                    "code": code,
-                    "client_id": settings.GOOGLE_CLIENT_ID,
-                    "client_secret": settings.GOOGLE_CLIENT_SECRET,
-                    "redirect_uri": settings.GOOGLE_REDIRECT_URI,
-                    "grant_type": "authorization_code",
-                }
-            )
-            response.raise_for_status()
-            token_data = response.json()
-        
-        # Get user info
-        async with httpx.AsyncClient() as client:
-            user_response = await client.get(
-                "https://www.googleapis.com/oauth2/v2/userinfo",
-                headers={"Authorization": f"Bearer {token_data['access_token']}"}
-            )
-            user_response.raise_for_status()
-            google_user = user_response.json()
+        # Exchange code for tokens and verify the id_token locally
+        token_data = await google_oauth.exchange_code(code)
+        google_user = await google_oauth.verify_id_token(
+            token_data["id_token"], access_token=token_data.get("access_token")
+        )
         
         email = google_user.get("email")
         name = google_user.get("name", "")
         picture = google_user.get("picture", "")
         
-        if not email:
-            raise HTTPException(status_code=400, detail="Email not provided by Google")
-        
-        # Check if user exists
-        user = crud_user.get_by_email(db, email=email)
+        if not email or not google_user.get("email_verified"):
+            raise HTTPException(status_code=400, detail="Verified email not provided by Google")
         
-        if not user:
-            # Create new user from Google account
-            # Use short UUID-based dummy password (Google users won't use it)
-            import uuid
-            dummy_password = f"google_{uuid.uuid4().hex[:16]}"
-            
-            user_in = UserCreate(
-                email=email,
-                password=dummy_password,
-                full_name=name
-            )
-            user = crud_user.create(db, obj_in=user_in)
-            
-            # Mark as verified and update avatar
-            from app.schemas.user import UserUpdate
-            user_update = UserUpdate(
-                is_email_verified=True,
-                avatar_url=picture if picture else None
-            )
-            user = crud_user.update(db, db_obj=user, obj_in=user_update)
-        
-        # Create access token
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            subject=user.id, expires_delta=access_token_expires
+        # Create or update the user in one statement; Google accounts get
+        # no usable password, so nothing is hashed
+        user = await crud_user.aprovision_oauth(
+            db, email=email, full_name=name or None, avatar_url=picture or None
         )
+        if not crud_user.is_active(user):
+            raise HTTPException(status_code=400, detail="Inactive user")
         
-        return {
-            "access_token": access_token,
-            "token_type": "bearer"
-        }
+        # Create access and refresh tokens
+        return token_service.issue_tokens(user)
         
+    except HTTPException:
+        raise
     except httpx.HTTPStatusError as e:
         raise HTTPException(
             status_code=400,
             detail=f"Failed to authenticate with Google: {str(e)}"
         )
+    except (JWTError, KeyError) as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid Google id_token: {str(e)}"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
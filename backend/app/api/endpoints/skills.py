@@ -1,12 +1,20 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_active_user, get_db
+from app.api.deps import (
+    check_batch_size,
+    check_quota,
+    get_current_active_user,
+    get_async_db,
+    raise_not_owned,
+    record_usage,
+)
+from app.api.pagination import decode_cursor, set_next_cursor
 from app.crud.base import CRUDBase
-from app.models.user import User
+from app.core.user_cache import UserPrincipal
 from app.models.skill import Skill
-from app.schemas.skill import Skill as SkillSchema, SkillCreate, SkillUpdate
+from app.schemas.skill import Skill as SkillSchema, SkillBatchUpdate, SkillCreate, SkillUpdate
 
 router = APIRouter()
 
@@ -15,75 +23,136 @@ crud_skill = CRUDBase[Skill, SkillCreate, SkillUpdate](Skill)
 
 
 @router.get("/", response_model=List[SkillSchema])
-def read_skills(
-    db: Session = Depends(get_db),
+async def read_skills(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Retrieve skills for current user.
     """
-    skills = db.query(Skill).filter(Skill.user_id == current_user.id).offset(skip).limit(limit).all()
+    skills = await crud_skill.aget_multi_by_user(
+        db,
+        user_id=current_user.id,
+        skip=skip,
+        limit=limit,
+        after_id=decode_cursor(cursor)
+    )
+    set_next_cursor(response, skills, limit)
     return skills
 
 
 @router.post("/", response_model=SkillSchema, status_code=201)
-def create_skill(
+async def create_skill(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     skill_in: SkillCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Create new skill for current user.
     """
-    skill_data = skill_in.dict()
-    skill = Skill(**skill_data, user_id=current_user.id)
-    db.add(skill)
-    db.commit()
-    db.refresh(skill)
+    await check_quota(db, current_user, crud_skill.model)
+    skill = await crud_skill.acreate_with_user(
+        db=db, obj_in=skill_in, user_id=current_user.id
+    )
+    record_usage(user_id=current_user.id, model=crud_skill.model, delta=1)
     return skill
 
 
+@router.post("/batch", response_model=List[SkillSchema], status_code=201)
+async def create_skills_batch(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    skills_in: List[SkillCreate],
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> Any:
+    """
+    Create many skills for current user in a single transaction.
+    """
+    check_batch_size(len(skills_in))
+    await check_quota(db, current_user, crud_skill.model, len(skills_in))
+    skills = await crud_skill.acreate_multi(
+        db=db, objs_in=skills_in, user_id=current_user.id
+    )
+    record_usage(user_id=current_user.id, model=crud_skill.model, delta=len(skills))
+    return skills
+
+
+@router.put("/batch", response_model=List[SkillSchema])
+async def update_skills_batch(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    skills_in: List[SkillBatchUpdate],
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> Any:
+    """
+    Update many skills in a single transaction.
+    Items that do not exist or belong to another user are skipped.
+    """
+    check_batch_size(len(skills_in))
+    skills = await crud_skill.aupdate_multi(
+        db=db, objs_in=skills_in, user_id=current_user.id
+    )
+    return skills
+
+
+@router.delete("/batch", response_model=List[SkillSchema])
+async def delete_skills_batch(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    ids: List[int] = Query(...),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> Any:
+    """
+    Delete many skills in a single statement.
+    Ids that do not exist or belong to another user are skipped.
+    """
+    check_batch_size(len(ids))
+    skills = await crud_skill.aremove_multi(
+        db=db, ids=ids, user_id=current_user.id
+    )
+    record_usage(user_id=current_user.id, model=crud_skill.model, delta=-len(skills))
+    return skills
+
+
 @router.put("/{skill_id}", response_model=SkillSchema)
-def update_skill(
+async def update_skill(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     skill_id: int,
     skill_in: SkillUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Update a skill.
     """
-    skill = crud_skill.get(db=db, id=skill_id)
+    skill = await crud_skill.aupdate_owned(
+        db=db, 
+        id=skill_id, 
+        user_id=current_user.id, 
+        obj_in=skill_in
+    )
     if not skill:
-        raise HTTPException(status_code=404, detail="Skill not found")
-    
-    if skill.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-    
-    skill = crud_skill.update(db=db, db_obj=skill, obj_in=skill_in)
+        await raise_not_owned(crud_skill, db, id=skill_id, name="Skill")
     return skill
 
 
 @router.delete("/{skill_id}", response_model=SkillSchema)
-def delete_skill(
+async def delete_skill(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     skill_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Delete a skill.
     """
-    skill = crud_skill.get(db=db, id=skill_id)
+    skill = await crud_skill.adelete_owned(db=db, id=skill_id, user_id=current_user.id)
     if not skill:
-        raise HTTPException(status_code=404, detail="Skill not found")
-    
-    if skill.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-    
-    skill = crud_skill.remove(db=db, id=skill_id)
+        await raise_not_owned(crud_skill, db, id=skill_id, name="Skill")
+    record_usage(user_id=current_user.id, model=crud_skill.model, delta=-1)
     return skill
@@ -0,0 +1,43 @@
+import base64
+import json
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException, Response
+
+# Response header carrying the opaque cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the last row id of a page as an opaque cursor"""
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Returns the id to continue after, or None for the first page.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return int(data["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def set_next_cursor(response: Response, items: Sequence[Any], limit: int) -> None:
+    """
+    Attach the next-page cursor to the response when the page is full.
+
+    Items may be ORM objects or dicts; either way they must expose ``id``.
+    """
+    if limit <= 0 or len(items) < limit:
+        return
+    last = items[-1]
+    last_id = last["id"] if isinstance(last, dict) else last.id
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last_id)
@@ -24,9 +24,73 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+    # Sizing of the in-memory revoked refresh-token filter
+    REVOCATION_FILTER_CAPACITY: int = 100000
+    REVOCATION_FILTER_ERROR_RATE: float = 0.001
+    # Per-process cache of authenticated user principals
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    USER_CACHE_TTL_SECONDS: float = 60.0
+    # Per-process cache of verified access-token payloads (entries expire with the token)
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    # bcrypt cost; existing hashes are upgraded on next login when it changes
+    BCRYPT_ROUNDS: int = 12
+    # Dedicated password-hashing threads and how many calls may wait for them
+    # (0 = unbounded); a full queue answers 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    
+    # Rate limiting of login/OTP endpoints (GCRA: sustained rate + burst)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_IP_PER_MINUTE: int = 30
+    RATE_LIMIT_IP_BURST: int = 10
+    RATE_LIMIT_EMAIL_PER_MINUTE: int = 5
+    RATE_LIMIT_EMAIL_BURST: int = 5
+    # Shared limiter state across workers; requires the redis package
+    RATE_LIMIT_REDIS_URL: str = ""
+    # Concurrent requests on those endpoints before new ones are shed with 503
+    AUTH_MAX_CONCURRENT: int = 32
+    
+    # Per-tier quotas (0 = unlimited)
+    FREE_REQUESTS_PER_MINUTE: int = 120
+    PRO_REQUESTS_PER_MINUTE: int = 600
+    FREE_MAX_ACHIEVEMENTS: int = 100
+    FREE_MAX_SKILLS: int = 50
+    FREE_MAX_GOALS: int = 20
+    PRO_MAX_ACHIEVEMENTS: int = 0
+    PRO_MAX_SKILLS: int = 0
+    PRO_MAX_GOALS: int = 0
+    # Seconds before cached per-user row counts are recounted from the database
+    QUOTA_RECONCILE_SECONDS: float = 300.0
+    
+    # Request size limit: most items accepted by one /batch call
+    MAX_BATCH_SIZE: int = 500
+    
+    # Admin dashboard totals: "query" (one cached aggregate) or "counters"
+    # (seeded once, then adjusted on writes and periodically reconciled)
+    SYSTEM_STATS_MODE: str = "query"
+    SYSTEM_STATS_TTL_SECONDS: float = 30.0
+    SYSTEM_STATS_RECONCILE_SECONDS: float = 3600.0
+    # Admin user search outside PostgreSQL uses an in-process n-gram index,
+    # rebuilt in the background this often to pick up other workers' writes
+    # (0 disables; it is still built at startup)
+    USER_SEARCH_REBUILD_SECONDS: float = 600.0
     
     # Database
     DATABASE_URL: str
+    # Optional explicit asyncio URL; derived from DATABASE_URL when empty
+    ASYNC_DATABASE_URL: str = ""
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced; -1 disables
+    DB_POOL_PRE_PING: bool = True
+    DB_USE_NULL_POOL: bool = False  # Set when running behind PgBouncer transaction mode
+
+    # Read replicas - JSON array or comma-separated URLs; empty disables routing
+    DATABASE_REPLICA_URLS: str | List[str] = []
+    # Seconds a user's reads stay on the primary after they write
+    READ_YOUR_WRITES_SECONDS: float = 5.0
     
     # CORS - Can be overridden by environment variable
     BACKEND_CORS_ORIGINS: str | List[str] = json.dumps([
@@ -37,10 +101,10 @@ class Settings(BaseSettings):
         "http://127.0.0.1:3000",
     ])
     
-    @field_validator("BACKEND_CORS_ORIGINS", mode="before")
+    @field_validator("BACKEND_CORS_ORIGINS", "DATABASE_REPLICA_URLS", "GOOGLE_ISSUERS", mode="before")
     @classmethod
     def parse_cors_origins(cls, v):
-        """Parse CORS origins from JSON string or return list as-is"""
+        """Parse CORS origins / replica URLs from JSON string or return list as-is"""
         if isinstance(v, str):
             try:
                 # Try parsing as JSON array
@@ -59,12 +123,33 @@ class Settings(BaseSettings):
     GOOGLE_CLIENT_ID: str = ""
     GOOGLE_CLIENT_SECRET: str = ""
     GOOGLE_REDIRECT_URI: str = "http://localhost:3000/auth/callback/google"
+    # Overridable so a local stub server can stand in for Google
+    GOOGLE_TOKEN_URL: str = "https://oauth2.googleapis.com/token"
+    GOOGLE_JWKS_URL: str = "https://www.googleapis.com/oauth2/v3/certs"
+    GOOGLE_ISSUERS: str | List[str] = ["https://accounts.google.com", "accounts.google.com"]
+    
+    # Where OTP codes live: "sql" (otps table), "memory" (single process
+    # only) or "redis" (shared; requires the redis package and OTP_REDIS_URL)
+    OTP_STORE: str = "sql"
+    OTP_REDIS_URL: str = ""
+    # Expired/used OTP cleanup (0 disables the background sweeper)
+    OTP_SWEEP_INTERVAL_SECONDS: int = 300
+    OTP_SWEEP_BATCH_SIZE: int = 1000
     
     # Email service
     SENDGRID_API_KEY: str = ""
-    FROM_EMAIL: str = "noreply@achievement.app"
+    FROM_EMAIL: str = "noreply@achievementweb.com"
     FROM_NAME: str = "Achievement App"
     SENDGRID_TEMPLATE_ID: str = ""
+    # "sendgrid", "console" or "sink" (records in memory); empty picks SendGrid
+    # when configured, else console
+    EMAIL_TRANSPORT: str = ""
+    # Outbox workers: handlers only enqueue, these deliver with retries
+    EMAIL_WORKERS: int = 2
+    EMAIL_BATCH_SIZE: int = 20
+    EMAIL_POLL_INTERVAL_SECONDS: float = 1.0
+    EMAIL_MAX_ATTEMPTS: int = 5  # Then moved to email_dead_letters
+    EMAIL_RETRY_BASE_SECONDS: float = 5.0  # Doubles on each failed attempt
 
 
 # Create settings instance
@@ -0,0 +1,34 @@
+from typing import Optional
+
+import httpx
+
+# Bounded keep-alive pool shared by all outbound calls (OAuth, JWKS, ...)
+HTTP_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the app-lifetime AsyncClient, creating it on first use.
+    Reusing it keeps TCP/TLS connections warm between requests.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
+    return _client
+
+
+def set_http_client(client: Optional[httpx.AsyncClient]) -> None:
+    """Swap the shared client, e.g. for one pointed at a local stub server"""
+    global _client
+    _client = client
+
+
+async def close_http_client() -> None:
+    """Close the shared client on shutdown"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
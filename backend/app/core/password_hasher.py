@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_and_update_password
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full; surfaced as 503"""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a small dedicated thread pool.
+
+    bcrypt releases the GIL while hashing, so threads give real parallelism
+    without the startup and pickling cost of a process pool. Keeping it
+    separate from the request threadpool means a login burst queues here
+    instead of starving every other endpoint.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hasher"
+        )
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _run(self, submitted: float, fn: Callable, *args: Any) -> Any:
+        waited = time.perf_counter() - submitted
+        with self._lock:
+            self.queued -= 1
+            self.in_flight += 1
+            self.wait_total += waited
+            if waited > self.wait_max:
+                self.wait_max = waited
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+
+    def _submit(self, fn: Callable, *args: Any) -> Future:
+        with self._lock:
+            if self.max_queue > 0 and self.queued >= self.max_queue:
+                self.rejected += 1
+                raise PasswordHasherBusy()
+            self.queued += 1
+        return self._executor.submit(self._run, time.perf_counter(), fn, *args)
+
+    # Sync variants block the calling (request) thread but still draw on
+    # the hasher's own concurrency limit.
+
+    def hash(self, password: str) -> str:
+        return self._submit(get_password_hash, password).result()
+
+    def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        return self._submit(verify_and_update_password, password, hashed_password).result()
+
+    async def ahash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(get_password_hash, password))
+
+    async def averify_and_update(
+        self, password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        return await asyncio.wrap_future(
+            self._submit(verify_and_update_password, password, hashed_password)
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            started = self.completed + self.in_flight
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self.queued,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "wait_avg_ms": self.wait_total / started * 1000 if started else 0.0,
+                "wait_max_ms": self.wait_max * 1000,
+            }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
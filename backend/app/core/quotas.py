@@ -0,0 +1,93 @@
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.rate_limit import get_rate_limit_backend
+
+
+def tier_limits(tier: str) -> Dict[str, int]:
+    """Per-tier limits; 0 means unlimited"""
+    if tier == "pro":
+        return {
+            "requests_per_minute": settings.PRO_REQUESTS_PER_MINUTE,
+            "achievements": settings.PRO_MAX_ACHIEVEMENTS,
+            "skills": settings.PRO_MAX_SKILLS,
+            "goals": settings.PRO_MAX_GOALS,
+        }
+    return {
+        "requests_per_minute": settings.FREE_REQUESTS_PER_MINUTE,
+        "achievements": settings.FREE_MAX_ACHIEVEMENTS,
+        "skills": settings.FREE_MAX_SKILLS,
+        "goals": settings.FREE_MAX_GOALS,
+    }
+
+
+class UsageCounters:
+    """
+    Per-process cache of how many rows each user owns per table.
+
+    Creates and deletes adjust the cached count in place; an entry older
+    than ``QUOTA_RECONCILE_SECONDS`` is recounted from the database on its
+    next check, which also corrects drift from other workers. Checks are
+    not transactional, so concurrent creates can overshoot by a few rows.
+    """
+
+    def __init__(self, reconcile_seconds: float):
+        self.reconcile_seconds = reconcile_seconds
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[int, str], Tuple[float, int]] = {}
+        self.reconciles = 0
+
+    def _get(self, key: Tuple[int, str]) -> Optional[int]:
+        with self._lock:
+            entry = self._counts.get(key)
+        if entry is None or entry[0] + self.reconcile_seconds <= time.monotonic():
+            return None
+        return entry[1]
+
+    async def aget(self, db: AsyncSession, *, user_id: int, model: Any) -> int:
+        """Current row count, counting from the database only when stale"""
+        key = (user_id, model.__tablename__)
+        count = self._get(key)
+        if count is None:
+            count = await db.scalar(
+                select(func.count()).select_from(model).where(model.user_id == user_id)
+            )
+            with self._lock:
+                self._counts[key] = (time.monotonic(), count)
+                self.reconciles += 1
+        return count
+
+    def adjust(self, *, user_id: int, model: Any, delta: int) -> None:
+        """Apply a committed create (+n) or delete (-n) to a cached count"""
+        key = (user_id, model.__tablename__)
+        with self._lock:
+            entry = self._counts.get(key)
+            if entry is not None:
+                self._counts[key] = (entry[0], max(0, entry[1] + delta))
+
+    def invalidate(self, user_id: int) -> None:
+        """Force a recount, e.g. after the user's tier or data changed in bulk"""
+        with self._lock:
+            for key in [key for key in self._counts if key[0] == user_id]:
+                del self._counts[key]
+
+
+usage_counters = UsageCounters(settings.QUOTA_RECONCILE_SECONDS)
+
+# Per-user request rate shares the auth limiter's backend type (memory or Redis)
+request_rate_backend = get_rate_limit_backend()
+
+
+async def check_request_rate(user_id: int, tier: str) -> float:
+    """Record a request; return 0 if within the tier's rate, else seconds to wait"""
+    per_minute = tier_limits(tier)["requests_per_minute"]
+    if per_minute <= 0:
+        return 0.0
+    return await request_rate_backend.hit(
+        f"user:{user_id}", 60.0 / per_minute, max(1, per_minute // 4)
+    )
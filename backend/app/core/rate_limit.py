@@ -0,0 +1,185 @@
+import json
+import math
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    from redis import asyncio as redis_asyncio
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+class MemoryRateLimitBackend:
+    """
+    GCRA (generic cell rate algorithm) state kept in this process.
+
+    Each key stores only its theoretical arrival time (TAT), so a limit is
+    one float per client regardless of the window.
+    """
+
+    # Expired keys are swept once the table grows past this size
+    SWEEP_THRESHOLD = 10000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tat: Dict[str, float] = {}
+
+    async def hit(self, key: str, interval: float, burst: int) -> float:
+        """Record a request; return 0 if allowed, else seconds until allowed"""
+        now = time.time()
+        with self._lock:
+            new_tat = max(self._tat.get(key, now), now) + interval
+            allow_at = new_tat - interval * burst
+            if now < allow_at:
+                return allow_at - now
+            self._tat[key] = new_tat
+            if len(self._tat) > self.SWEEP_THRESHOLD:
+                self._tat = {k: tat for k, tat in self._tat.items() if tat > now}
+        return 0.0
+
+
+class RedisRateLimitBackend:
+    """GCRA state in Redis so limits hold across workers and hosts"""
+
+    SCRIPT = """
+    local now = tonumber(ARGV[1])
+    local interval = tonumber(ARGV[2])
+    local burst = tonumber(ARGV[3])
+    local tat = tonumber(redis.call('GET', KEYS[1]) or ARGV[1])
+    if tat < now then tat = now end
+    local new_tat = tat + interval
+    local allow_at = new_tat - interval * burst
+    if now < allow_at then return tostring(allow_at - now) end
+    redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+    return '0'
+    """
+
+    def __init__(self, url: str):
+        self._client = redis_asyncio.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    async def hit(self, key: str, interval: float, burst: int) -> float:
+        result = await self._script(
+            keys=[f"ratelimit:{key}"], args=[time.time(), interval, burst]
+        )
+        return float(result)
+
+
+def get_rate_limit_backend():
+    """Redis when RATE_LIMIT_REDIS_URL is set (and redis is installed), else memory"""
+    if settings.RATE_LIMIT_REDIS_URL:
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("RATE_LIMIT_REDIS_URL is set but the redis package is not installed")
+        return RedisRateLimitBackend(settings.RATE_LIMIT_REDIS_URL)
+    return MemoryRateLimitBackend()
+
+
+class RateLimitMiddleware:
+    """
+    Throttle the unauthenticated auth endpoints by client IP and by email.
+
+    Requests beyond ``AUTH_MAX_CONCURRENT`` in flight on these paths are
+    shed with 503 before any work is done, so a credential-stuffing burst
+    queues nothing behind bcrypt and the rest of the API keeps its latency.
+    """
+
+    def __init__(self, app: ASGIApp, paths: List[str], backend=None):
+        self.app = app
+        self.paths = set(paths)
+        self.backend = backend or get_rate_limit_backend()
+        self.ip_interval = 60.0 / settings.RATE_LIMIT_IP_PER_MINUTE
+        self.email_interval = 60.0 / settings.RATE_LIMIT_EMAIL_PER_MINUTE
+        self.in_flight = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        if self.in_flight >= settings.AUTH_MAX_CONCURRENT:
+            await self._reject(send, 503, 1.0, "Server busy, please retry shortly")
+            return
+
+        self.in_flight += 1
+        try:
+            body, receive = await self._buffer_body(scope, receive)
+            retry_after = await self._check(scope, body)
+            if retry_after:
+                await self._reject(send, 429, retry_after, "Too many requests")
+                return
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+    async def _check(self, scope: Scope, body: bytes) -> float:
+        path = scope["path"]
+        client = scope.get("client")
+        ip = client[0] if client else "unknown"
+        retry_after = await self.backend.hit(
+            f"{path}:ip:{ip}", self.ip_interval, settings.RATE_LIMIT_IP_BURST
+        )
+        if retry_after:
+            return retry_after
+
+        email = self._email(scope, body)
+        if email:
+            return await self.backend.hit(
+                f"{path}:email:{email}", self.email_interval, settings.RATE_LIMIT_EMAIL_BURST
+            )
+        return 0.0
+
+    @staticmethod
+    def _email(scope: Scope, body: bytes) -> Optional[str]:
+        """Email from the query string, or the login form's username field"""
+        params = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        if body:
+            params.update(parse_qs(body.decode("utf-8", "replace")))
+        values = params.get("email") or params.get("username")
+        return values[0].strip().lower() if values else None
+
+    @staticmethod
+    async def _buffer_body(scope: Scope, receive: Receive) -> Tuple[bytes, Receive]:
+        """Read a form body so it can be inspected, then replay it downstream"""
+        headers = dict(scope.get("headers") or [])
+        content_type = headers.get(b"content-type", b"")
+        if not content_type.startswith(b"application/x-www-form-urlencoded"):
+            return b"", receive
+
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+        replayed = False
+
+        async def replay() -> Message:
+            nonlocal replayed
+            if replayed:
+                return await receive()
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        return body, replay
+
+    @staticmethod
+    async def _reject(send: Send, status: int, retry_after: float, detail: str) -> None:
+        payload = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(payload)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": payload})
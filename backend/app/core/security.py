@@ -1,20 +1,53 @@
+import uuid
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Dict, Optional, Tuple, Union
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Stored for accounts created without a password (e.g. Google sign-in).
+# Never produced by bcrypt, so no password can match it.
+UNUSABLE_PASSWORD = "!"
 
+# Password hashing context; hashes at any other cost are upgraded on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+)
 
-def create_access_token(subject: Union[str, Any], expires_delta: timedelta = None) -> str:
+
+def user_token_claims(user: Any) -> Dict[str, Any]:
+    """
+    Principal claims embedded in access tokens so requests can be
+    authorised without loading the user.
+    
+    Args:
+        user: User instance (or principal) the token is issued for
+        
+    Returns:
+        Claims dict for create_access_token
+    """
+    return {
+        "ver": user.token_version,
+        "active": user.is_active,
+        "admin": user.is_superuser,
+        "tier": user.subscription_tier,
+    }
+
+
+def create_access_token(
+    subject: Union[str, Any],
+    expires_delta: timedelta = None,
+    claims: Optional[Dict[str, Any]] = None
+) -> str:
     """
     Create a JWT access token.
     
     Args:
         subject: The subject to encode (usually user ID or email)
         expires_delta: Token expiration time
+        claims: Extra claims to include (see user_token_claims)
         
     Returns:
         Encoded JWT token
@@ -26,7 +59,7 @@ def create_access_token(subject: Union[str, Any], expires_delta: timedelta = Non
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(
         to_encode, 
         settings.SECRET_KEY, 
@@ -35,6 +68,28 @@ def create_access_token(subject: Union[str, Any], expires_delta: timedelta = Non
     return encoded_jwt
 
 
+def create_refresh_token(subject: Union[str, Any], token_version: int) -> str:
+    """
+    Create a JWT refresh token.
+    
+    Args:
+        subject: The subject to encode (user ID)
+        token_version: User's current token_version; bumping it revokes the token
+        
+    Returns:
+        Encoded JWT token with a unique jti for rotation/revocation
+    """
+    expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    to_encode = {
+        "typ": "refresh",
+        "jti": uuid.uuid4().hex,
+        "ver": token_version,
+        "exp": expire,
+        "sub": str(subject),
+    }
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against its hash.
@@ -49,6 +104,27 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def has_usable_password(hashed_password: Optional[str]) -> bool:
+    """Check whether an account can sign in with a password at all"""
+    return bool(hashed_password) and hashed_password != UNUSABLE_PASSWORD
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if the stored hash is outdated.
+    
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password from database
+        
+    Returns:
+        (matches, new hash to store or None)
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """
     Hash a password using bcrypt.
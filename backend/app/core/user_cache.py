@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """
+    The slice of a user that authorisation needs.
+
+    Returned by ``get_current_user`` instead of the full ORM row so that
+    authenticated requests can be served from cache; endpoints that need
+    the full profile load it explicitly.
+    """
+    id: int
+    is_active: bool
+    is_superuser: bool
+    subscription_tier: str
+    token_version: int = 0
+
+    @classmethod
+    def from_user(cls, user: Any) -> "UserPrincipal":
+        """Build from a User instance or a row with the same column names"""
+        return cls(
+            id=user.id,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+            subscription_tier=user.subscription_tier,
+            token_version=user.token_version,
+        )
+
+
+class UserCache:
+    """
+    Bounded, per-process TTL + LRU cache of user principals keyed by id.
+
+    Writes through CRUDUser invalidate entries in this process; the TTL
+    bounds how long another worker can serve a stale principal.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, Tuple[float, UserPrincipal]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, user_id: int) -> Optional[UserPrincipal]:
+        """Return a cached principal, or None on miss/expiry"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, principal: UserPrincipal) -> UserPrincipal:
+        """Cache a principal, evicting the least recently used on overflow"""
+        if self.max_entries <= 0:
+            return principal
+        with self._lock:
+            self._entries[principal.id] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return principal
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user's cached principal after their row changed"""
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+user_cache = UserCache(
+    max_entries=settings.USER_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
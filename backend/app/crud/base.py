@@ -1,6 +1,7 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
-from fastapi.encoders import jsonable_encoder
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 from pydantic import BaseModel
+from sqlalchemy import Delete, Insert, Select, Update, bindparam, delete, exists, insert, inspect, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.db.base_class import BaseModel as DBBaseModel
 
@@ -12,6 +13,9 @@ UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
     CRUD base class with default methods to Create, Read, Update, Delete (CRUD).
+
+    Every sync method has an ``a``-prefixed async twin that takes an
+    AsyncSession, for routes that run on the event loop.
     """
     
     def __init__(self, model: Type[ModelType]):
@@ -22,24 +26,191 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             model: SQLAlchemy model class
         """
         self.model = model
+
+    def paginate(
+        self,
+        stmt: Select,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> Select:
+        """
+        Apply a stable ``id`` ordering and either keyset or offset paging.
+
+        With ``after_id`` (decoded from a cursor) the page starts right after
+        that row and ``skip`` is ignored, so deep pages cost the same as the
+        first one given an index ending in ``id``.
+        """
+        stmt = stmt.order_by(self.model.id)
+        if after_id is not None:
+            stmt = stmt.where(self.model.id > after_id)
+        elif skip:
+            stmt = stmt.offset(skip)
+        return stmt.limit(limit)
+
+    # ------------------------------------------------------------
+    # Statement builders shared by the sync and async bulk methods
+    # ------------------------------------------------------------
+
+    def _insert_stmt(self, values: Dict[str, Any]) -> Insert:
+        """
+        Single-row ``INSERT ... RETURNING`` that yields a fully loaded
+        instance, so no refresh SELECT is needed after commit.
+        """
+        return insert(self.model).values(**values).returning(self.model)
+
+    def _changed_values(
+        self,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Column values in ``obj_in`` that differ from ``db_obj``.
+
+        Reads the instance's loaded state directly so comparing never
+        triggers a lazy load; unloaded columns count as changed.
+        """
+        loaded = inspect(db_obj).dict
+        return {
+            field: value
+            for field, value in self._column_values(obj_in).items()
+            if field not in loaded or loaded[field] != value
+        }
+
+    def _update_stmt(self, id: Any, values: Dict[str, Any]) -> Update:
+        """
+        ``UPDATE ... WHERE id = :id RETURNING *``; the returned row overwrites
+        the identity-mapped instance so callers see the new state.
+        """
+        return (
+            update(self.model)
+            .where(self.model.id == id)
+            .values(**values)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+
+    def _update_owned_stmt(self, id: Any, user_id: int, values: Dict[str, Any]) -> Update:
+        """
+        Owned ``UPDATE ... RETURNING`` that only matches when some value
+        actually differs, so an unchanged row is neither written nor has
+        its ``updated_at`` bumped.
+        """
+        differs = or_(*(
+            self.model.__table__.c[field].is_distinct_from(value)
+            for field, value in values.items()
+        ))
+        return self._owned(self._update_stmt(id, values), user_id).where(differs)
+
+    def _owned(self, stmt, user_id: Optional[int]):
+        """Restrict a statement to rows owned by ``user_id`` when given"""
+        if user_id is not None:
+            stmt = stmt.where(self.model.user_id == user_id)
+        return stmt
+
+    def _column_values(self, obj_in: Union[UpdateSchemaType, Dict[str, Any]]) -> Dict[str, Any]:
+        """Settable column values from an update schema or dict"""
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        columns = self.model.__table__.columns
+        return {field: value for field, value in update_data.items() if field in columns and field != "id"}
+
+    def _get_owned_stmt(self, id: Any, user_id: int) -> Select:
+        return select(self.model).where(self.model.id == id, self.model.user_id == user_id)
+
+    def _exists_stmt(self, id: Any) -> Select:
+        return select(exists().where(self.model.id == id))
+
+    def _create_multi_params(
+        self, objs_in: Sequence[CreateSchemaType], user_id: Optional[int]
+    ) -> Tuple[Insert, List[Dict[str, Any]]]:
+        rows = []
+        for obj_in in objs_in:
+            row = obj_in.model_dump()
+            if user_id is not None:
+                row["user_id"] = user_id
+            rows.append(row)
+        # insertmanyvalues batches the rows into multi-row INSERT ... RETURNING
+        stmt = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        return stmt, rows
+
+    def _update_multi_params(
+        self,
+        objs_in: Sequence[Union[UpdateSchemaType, Dict[str, Any]]],
+        user_id: Optional[int]
+    ) -> Tuple[List[int], List[Tuple[Update, List[Dict[str, Any]]]]]:
+        """
+        Group per-row changes by the set of columns they touch, so each
+        group is one executemany of ``UPDATE ... WHERE id = :_id``.
+        """
+        table = self.model.__table__
+        ids: List[int] = []
+        groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+        for obj_in in objs_in:
+            if isinstance(obj_in, dict):
+                data = dict(obj_in)
+            else:
+                data = obj_in.model_dump(exclude_unset=True)
+            obj_id = data.pop("id")
+            ids.append(obj_id)
+            if data:
+                groups.setdefault(frozenset(data), []).append({"_id": obj_id, **data})
+
+        batches = []
+        for params in groups.values():
+            stmt = update(table).where(table.c.id == bindparam("_id"))
+            if user_id is not None:
+                stmt = stmt.where(table.c.user_id == user_id)
+            batches.append((stmt, params))
+        return ids, batches
+
+    def _get_by_ids_stmt(self, ids: Sequence[int], user_id: Optional[int]) -> Select:
+        stmt = self._owned(select(self.model).where(self.model.id.in_(ids)), user_id)
+        # Reload even if the rows are already in the identity map
+        return stmt.order_by(self.model.id).execution_options(populate_existing=True)
+
+    def _remove_multi_children(self, ids: Sequence[int], user_id: Optional[int]) -> List[Delete]:
+        """
+        Statements deleting dependent rows before a bulk delete. Bulk DELETE
+        bypasses ORM cascades, so models with child tables override this.
+        """
+        return []
+
+    def _remove_multi_stmt(self, ids: Sequence[int], user_id: Optional[int]) -> Delete:
+        stmt = self._owned(delete(self.model).where(self.model.id.in_(ids)), user_id)
+        return stmt.returning(self.model)
     
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
         """Get a single record by ID"""
         return db.query(self.model).filter(self.model.id == id).first()
     
     def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
     ) -> List[ModelType]:
         """Get multiple records with pagination"""
-        return db.query(self.model).offset(skip).limit(limit).all()
+        stmt = self.paginate(select(self.model), skip=skip, limit=limit, after_id=after_id)
+        return list(db.execute(stmt).scalars().all())
     
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         """Create a new record"""
-        obj_in_data = jsonable_encoder(obj_in)
-        db_obj = self.model(**obj_in_data)
-        db.add(db_obj)
+        db_obj = db.scalar(self._insert_stmt(obj_in.model_dump()))
+        db.commit()
+        return db_obj
+
+    def create_with_user(
+        self, db: Session, *, obj_in: CreateSchemaType, user_id: int
+    ) -> ModelType:
+        """Create a record owned by a specific user"""
+        db_obj = db.scalar(self._insert_stmt({**obj_in.model_dump(), "user_id": user_id}))
         db.commit()
-        db.refresh(db_obj)
         return db_obj
     
     def update(
@@ -49,20 +220,13 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
-        """Update a record"""
-        obj_data = jsonable_encoder(db_obj)
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.dict(exclude_unset=True)
-        
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
+        """Update only the changed columns; no-op updates skip the write"""
+        values = self._changed_values(db_obj, obj_in)
+        if not values:
+            return db_obj
         
-        db.add(db_obj)
+        db_obj = db.scalar(self._update_stmt(db_obj.id, values))
         db.commit()
-        db.refresh(db_obj)
         return db_obj
     
     def remove(self, db: Session, *, id: int) -> ModelType:
@@ -71,3 +235,266 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.delete(obj)
         db.commit()
         return obj
+
+    def create_multi(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[CreateSchemaType],
+        user_id: Optional[int] = None
+    ) -> List[ModelType]:
+        """Create many records in one transaction and one INSERT ... RETURNING"""
+        if not objs_in:
+            return []
+        stmt, rows = self._create_multi_params(objs_in, user_id)
+        db_objs = list(db.scalars(stmt, rows).all())
+        db.commit()
+        return db_objs
+
+    def exists(self, db: Session, *, id: Any) -> bool:
+        """Check whether a record exists; used to tell 403 from 404"""
+        return bool(db.scalar(self._exists_stmt(id)))
+
+    def get_owned(self, db: Session, *, id: Any, user_id: int) -> Optional[ModelType]:
+        """
+        Get a record only if ``user_id`` owns it. ``None`` means missing or
+        not owned; call ``exists`` on that (rare) path to tell them apart.
+        """
+        return db.scalar(self._get_owned_stmt(id, user_id))
+
+    def update_owned(
+        self,
+        db: Session,
+        *,
+        id: Any,
+        user_id: int,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> Optional[ModelType]:
+        """
+        Update a record owned by ``user_id`` with one UPDATE ... RETURNING.
+        When nothing differs no row is written and the current one is returned.
+        """
+        values = self._column_values(obj_in)
+        if not values:
+            return self.get_owned(db, id=id, user_id=user_id)
+        db_obj = db.scalar(self._update_owned_stmt(id, user_id, values))
+        db.commit()
+        if db_obj is None:
+            # Unchanged, missing or not owned; only the first returns a row
+            return self.get_owned(db, id=id, user_id=user_id)
+        return db_obj
+
+    def delete_owned(self, db: Session, *, id: Any, user_id: int) -> Optional[ModelType]:
+        """Delete a record owned by ``user_id`` with one DELETE ... RETURNING"""
+        for stmt in self._remove_multi_children([id], user_id):
+            db.execute(stmt)
+        db_obj = db.scalar(self._remove_multi_stmt([id], user_id))
+        db.commit()
+        return db_obj
+
+    def update_multi(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[Union[UpdateSchemaType, Dict[str, Any]]],
+        user_id: Optional[int] = None
+    ) -> List[ModelType]:
+        """
+        Update many records (each item carries its ``id``) in one transaction.
+        Rows not owned by ``user_id`` are left untouched and not returned.
+        """
+        if not objs_in:
+            return []
+        ids, batches = self._update_multi_params(objs_in, user_id)
+        for stmt, params in batches:
+            db.execute(stmt, params)
+        db_objs = list(db.scalars(self._get_by_ids_stmt(ids, user_id)).all())
+        db.commit()
+        return db_objs
+
+    def remove_multi(
+        self,
+        db: Session,
+        *,
+        ids: Sequence[int],
+        user_id: Optional[int] = None
+    ) -> List[ModelType]:
+        """Delete many records with one DELETE ... RETURNING"""
+        if not ids:
+            return []
+        for stmt in self._remove_multi_children(ids, user_id):
+            db.execute(stmt)
+        db_objs = list(db.scalars(self._remove_multi_stmt(ids, user_id)).all())
+        db.commit()
+        return db_objs
+
+    # ------------------------------------------------------------
+    # Async variants
+    # ------------------------------------------------------------
+
+    async def aget(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        """Get a single record by ID"""
+        return await db.get(self.model, id)
+
+    async def aget_multi(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> List[ModelType]:
+        """Get multiple records with pagination"""
+        stmt = self.paginate(select(self.model), skip=skip, limit=limit, after_id=after_id)
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def aget_multi_by_user(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> List[ModelType]:
+        """Get records owned by a user (models with a ``user_id`` column)"""
+        stmt = select(self.model).where(self.model.user_id == user_id)
+        stmt = self.paginate(stmt, skip=skip, limit=limit, after_id=after_id)
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def acreate(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        """Create a new record"""
+        db_obj = await db.scalar(self._insert_stmt(obj_in.model_dump()))
+        await db.commit()
+        return db_obj
+
+    async def acreate_with_user(
+        self, db: AsyncSession, *, obj_in: CreateSchemaType, user_id: int
+    ) -> ModelType:
+        """Create a record owned by a specific user"""
+        db_obj = await db.scalar(
+            self._insert_stmt({**obj_in.model_dump(), "user_id": user_id})
+        )
+        await db.commit()
+        return db_obj
+
+    async def aupdate(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        """Update only the changed columns; no-op updates skip the write"""
+        values = self._changed_values(db_obj, obj_in)
+        if not values:
+            return db_obj
+
+        db_obj = await db.scalar(self._update_stmt(db_obj.id, values))
+        await db.commit()
+        return db_obj
+
+    async def aremove(self, db: AsyncSession, *, id: int) -> ModelType:
+        """Delete a record"""
+        obj = await db.get(self.model, id)
+        await db.delete(obj)
+        await db.commit()
+        return obj
+
+    async def acreate_multi(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[CreateSchemaType],
+        user_id: Optional[int] = None
+    ) -> List[ModelType]:
+        """Create many records in one transaction and one INSERT ... RETURNING"""
+        if not objs_in:
+            return []
+        stmt, rows = self._create_multi_params(objs_in, user_id)
+        db_objs = list((await db.scalars(stmt, rows)).all())
+        await db.commit()
+        return db_objs
+
+    async def aexists(self, db: AsyncSession, *, id: Any) -> bool:
+        """Check whether a record exists; used to tell 403 from 404"""
+        return bool(await db.scalar(self._exists_stmt(id)))
+
+    async def aget_owned(
+        self, db: AsyncSession, *, id: Any, user_id: int
+    ) -> Optional[ModelType]:
+        """
+        Get a record only if ``user_id`` owns it. ``None`` means missing or
+        not owned; call ``aexists`` on that (rare) path to tell them apart.
+        """
+        return await db.scalar(self._get_owned_stmt(id, user_id))
+
+    async def aupdate_owned(
+        self,
+        db: AsyncSession,
+        *,
+        id: Any,
+        user_id: int,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> Optional[ModelType]:
+        """
+        Update a record owned by ``user_id`` with one UPDATE ... RETURNING.
+        When nothing differs no row is written and the current one is returned.
+        """
+        values = self._column_values(obj_in)
+        if not values:
+            return await self.aget_owned(db, id=id, user_id=user_id)
+        db_obj = await db.scalar(self._update_owned_stmt(id, user_id, values))
+        await db.commit()
+        if db_obj is None:
+            # Unchanged, missing or not owned; only the first returns a row
+            return await self.aget_owned(db, id=id, user_id=user_id)
+        return db_obj
+
+    async def adelete_owned(
+        self, db: AsyncSession, *, id: Any, user_id: int
+    ) -> Optional[ModelType]:
+        """Delete a record owned by ``user_id`` with one DELETE ... RETURNING"""
+        for stmt in self._remove_multi_children([id], user_id):
+            await db.execute(stmt)
+        db_obj = await db.scalar(self._remove_multi_stmt([id], user_id))
+        await db.commit()
+        return db_obj
+
+    async def aupdate_multi(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[Union[UpdateSchemaType, Dict[str, Any]]],
+        user_id: Optional[int] = None
+    ) -> List[ModelType]:
+        """
+        Update many records (each item carries its ``id``) in one transaction.
+        Rows not owned by ``user_id`` are left untouched and not returned.
+        """
+        if not objs_in:
+            return []
+        ids, batches = self._update_multi_params(objs_in, user_id)
+        for stmt, params in batches:
+            await db.execute(stmt, params)
+        db_objs = list((await db.scalars(self._get_by_ids_stmt(ids, user_id))).all())
+        await db.commit()
+        return db_objs
+
+    async def aremove_multi(
+        self,
+        db: AsyncSession,
+        *,
+        ids: Sequence[int],
+        user_id: Optional[int] = None
+    ) -> List[ModelType]:
+        """Delete many records with one DELETE ... RETURNING"""
+        if not ids:
+            return []
+        for stmt in self._remove_multi_children(ids, user_id):
+            await db.execute(stmt)
+        db_objs = list((await db.scalars(self._remove_multi_stmt(ids, user_id))).all())
+        await db.commit()
+        return db_objs
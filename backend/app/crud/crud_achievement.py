@@ -1,24 +1,16 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence
+from sqlalchemy import Delete, Select, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.crud.base import CRUDBase
 from app.models.achievement import Achievement
+from app.models.media import Media
 from app.schemas.achievement import AchievementCreate, AchievementUpdate
 
 
 class CRUDAchievement(CRUDBase[Achievement, AchievementCreate, AchievementUpdate]):
     """CRUD operations for Achievement model"""
     
-    def create_with_user(
-        self, db: Session, *, obj_in: AchievementCreate, user_id: int
-    ) -> Achievement:
-        """Create achievement for a specific user"""
-        obj_in_data = obj_in.dict()
-        db_obj = Achievement(**obj_in_data, user_id=user_id)
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
-    
     def get_multi_by_user(
         self, 
         db: Session, 
@@ -26,27 +18,69 @@ class CRUDAchievement(CRUDBase[Achievement, AchievementCreate, AchievementUpdate
         user_id: int, 
         skip: int = 0, 
         limit: int = 100,
-        category_id: Optional[int] = None
+        category_id: Optional[int] = None,
+        after_id: Optional[int] = None
     ) -> List[Achievement]:
         """Get achievements for a specific user with optional category filter"""
-        query = db.query(Achievement).filter(Achievement.user_id == user_id)
-        
-        if category_id is not None:
-            query = query.filter(Achievement.category_id == category_id)
-        
-        return query.offset(skip).limit(limit).all()
+        stmt = self._by_user_stmt(user_id=user_id, category_id=category_id)
+        stmt = self.paginate(stmt, skip=skip, limit=limit, after_id=after_id)
+        return list(db.execute(stmt).scalars().all())
     
     def get_public_achievements(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> List[Achievement]:
+        """Get all public achievements"""
+        stmt = select(Achievement).where(Achievement.is_public == True)
+        stmt = self.paginate(stmt, skip=skip, limit=limit, after_id=after_id)
+        return list(db.execute(stmt).scalars().all())
+
+    def _remove_multi_children(
+        self, ids: Sequence[int], user_id: Optional[int]
+    ) -> List[Delete]:
+        """Remove attached media first; bulk DELETE skips the ORM cascade"""
+        owned_ids = self._owned(select(Achievement.id).where(Achievement.id.in_(ids)), user_id)
+        return [delete(Media).where(Media.achievement_id.in_(owned_ids))]
+
+    def _by_user_stmt(self, *, user_id: int, category_id: Optional[int] = None) -> Select:
+        stmt = select(Achievement).where(Achievement.user_id == user_id)
+        if category_id is not None:
+            stmt = stmt.where(Achievement.category_id == category_id)
+        return stmt
+
+    async def aget_multi_by_user(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        category_id: Optional[int] = None,
+        after_id: Optional[int] = None
+    ) -> List[Achievement]:
+        """Get achievements for a specific user with optional category filter"""
+        stmt = self._by_user_stmt(user_id=user_id, category_id=category_id)
+        stmt = self.paginate(stmt, skip=skip, limit=limit, after_id=after_id)
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def aget_public_achievements(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
     ) -> List[Achievement]:
         """Get all public achievements"""
-        return (
-            db.query(Achievement)
-            .filter(Achievement.is_public == True)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        stmt = select(Achievement).where(Achievement.is_public == True)
+        stmt = self.paginate(stmt, skip=skip, limit=limit, after_id=after_id)
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
 
 
 # Create instance
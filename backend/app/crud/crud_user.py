@@ -1,29 +1,128 @@
-from typing import Optional
-from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+from sqlalchemy import Select, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
 from app.crud.base import CRUDBase
+from app.models.achievement import Achievement
+from app.models.goal import Goal
+from app.models.skill import Skill
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.core.password_hasher import password_hasher
+from app.core.security import UNUSABLE_PASSWORD, has_usable_password
+from app.core.user_cache import UserPrincipal, user_cache
+from app.services.growth_stats import growth_stats
+from app.services.system_stats import system_stats
+from app.services.user_search import user_search
+
+
+# (user, achievement_count, skill_count, goal_count)
+UserWithCounts = Tuple[User, int, int, int]
+
+# Changing any of these revokes the user's outstanding access tokens
+TOKEN_REVOKING_FIELDS = ("is_active", "is_superuser", "subscription_tier", "hashed_password")
+
+# Fields the admin user search indexes
+SEARCH_FIELDS = ("email", "full_name")
+
+# Fields counted on the admin dashboard
+SYSTEM_STATS_FIELDS = ("is_active", "is_email_verified", "subscription_tier")
 
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     """CRUD operations for User model"""
     
+    def _bump_token_version(self, db_obj: User, update_data: dict) -> dict:
+        """Add a token_version bump when a revoking field actually changes"""
+        changed = self._changed_values(db_obj, update_data)
+        if any(field in changed for field in TOKEN_REVOKING_FIELDS):
+            update_data["token_version"] = db_obj.token_version + 1
+        return update_data
+    
+    def _principal_stmt(self, id: int):
+        return select(
+            User.id,
+            User.is_active,
+            User.is_superuser,
+            User.subscription_tier,
+            User.token_version,
+        ).where(User.id == id)
+    
+    def _with_counts_stmt(self, users: Select) -> Select:
+        """
+        Attach achievement, skill and goal counts to the users selected by
+        ``users`` in one statement: each child table is counted once, grouped
+        by user_id and limited to that page, then outer-joined back.
+        """
+        page = users.cte("page")
+        user = aliased(User, page)
+        stmt = select(user)
+        for model in (Achievement, Skill, Goal):
+            counts = (
+                select(model.user_id, func.count().label("n"))
+                .where(model.user_id.in_(select(page.c.id)))
+                .group_by(model.user_id)
+                .subquery()
+            )
+            stmt = stmt.add_columns(func.coalesce(counts.c.n, 0)).outerjoin(
+                counts, counts.c.user_id == user.id
+            )
+        return stmt.order_by(user.id)
+    
+    def _revoke_tokens_stmt(self, id: int):
+        return (
+            update(User)
+            .where(User.id == id)
+            .values(token_version=User.token_version + 1)
+        )
+    
+    def _provision_oauth_stmt(
+        self,
+        dialect_name: str,
+        *,
+        email: str,
+        full_name: Optional[str],
+        avatar_url: Optional[str]
+    ):
+        """
+        Upsert a provider-verified user by email in one statement.
+        New users get no usable password; existing users are marked
+        verified and only have empty profile fields filled in.
+        """
+        insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+        stmt = insert(User).values(
+            email=email,
+            hashed_password=UNUSABLE_PASSWORD,
+            full_name=full_name,
+            avatar_url=avatar_url,
+            is_active=True,
+            is_email_verified=True,
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=[User.email],
+            set_={
+                "is_email_verified": True,
+                "full_name": func.coalesce(User.full_name, stmt.excluded.full_name),
+                "avatar_url": func.coalesce(User.avatar_url, stmt.excluded.avatar_url),
+            },
+        ).returning(User)
+    
     def get_by_email(self, db: Session, *, email: str) -> Optional[User]:
         """Get user by email"""
         return db.query(User).filter(User.email == email).first()
     
     def create(self, db: Session, *, obj_in: UserCreate) -> User:
         """Create new user with hashed password"""
-        db_obj = User(
-            email=obj_in.email,
-            hashed_password=get_password_hash(obj_in.password),
-            full_name=obj_in.full_name,
-            is_active=True,
-        )
-        db.add(db_obj)
+        db_obj = db.scalar(self._insert_stmt({
+            "email": obj_in.email,
+            "hashed_password": password_hasher.hash(obj_in.password),
+            "full_name": obj_in.full_name,
+            "is_active": True,
+        }))
         db.commit()
-        db.refresh(db_obj)
+        system_stats.record_user_created(db_obj)
+        user_search.add(db_obj.id, db_obj.email, db_obj.full_name)
         return db_obj
     
     def authenticate(self, db: Session, *, email: str, password: str) -> Optional[User]:
@@ -31,29 +130,236 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         user = self.get_by_email(db, email=email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        if not self.check_password(db, user=user, password=password):
             return None
         return user
     
-    def is_active(self, user: User) -> bool:
+    def check_password(
+        self, db: Session, *, user: User, password: str, rehash: bool = True
+    ) -> bool:
+        """
+        Verify a user's password, upgrading an outdated hash in place.
+        Pass rehash=False when the password is about to be replaced anyway.
+        """
+        if not has_usable_password(user.hashed_password):
+            return False
+        matches, new_hash = password_hasher.verify_and_update(password, user.hashed_password)
+        if matches and new_hash and rehash:
+            # Same password, so skip CRUDUser.update and its token revocation
+            super().update(db, db_obj=user, obj_in={"hashed_password": new_hash})
+        return matches
+    
+    def get_multi_with_counts(
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> List[UserWithCounts]:
+        """A page of users with their content counts, in a single query"""
+        users = self.paginate(select(User), skip=skip, limit=limit, after_id=after_id)
+        return [tuple(row) for row in db.execute(self._with_counts_stmt(users)).all()]
+    
+    def get_many_with_counts(self, db: Session, *, ids: List[int]) -> List[UserWithCounts]:
+        """Users with their content counts, in the order of ``ids``"""
+        if not ids:
+            return []
+        stmt = self._with_counts_stmt(select(User).where(User.id.in_(ids)))
+        rows = {row[0].id: tuple(row) for row in db.execute(stmt).all()}
+        return [rows[id] for id in ids if id in rows]
+    
+    def get_with_counts(self, db: Session, *, id: int) -> Optional[UserWithCounts]:
+        """One user with their content counts, in a single query"""
+        row = db.execute(self._with_counts_stmt(select(User).where(User.id == id))).first()
+        return tuple(row) if row else None
+    
+    def provision_oauth(
+        self,
+        db: Session,
+        *,
+        email: str,
+        full_name: Optional[str] = None,
+        avatar_url: Optional[str] = None
+    ) -> User:
+        """Create or update a passwordless user verified by an OAuth provider"""
+        stmt = self._provision_oauth_stmt(
+            db.get_bind().dialect.name, email=email, full_name=full_name, avatar_url=avatar_url
+        )
+        db_obj = db.scalar(stmt, execution_options={"populate_existing": True})
+        db.commit()
+        # The upsert may have changed an existing user's cached principal
+        user_cache.invalidate(db_obj.id)
+        # The upsert does not say whether it inserted, so recount
+        system_stats.invalidate()
+        user_search.add(db_obj.id, db_obj.email, db_obj.full_name)
+        return db_obj
+    
+    def is_active(self, user: User | UserPrincipal) -> bool:
         """Check if user is active"""
         return user.is_active
     
     def update(self, db: Session, *, db_obj: User, obj_in: UserUpdate | dict) -> User:
         """Update user, hash password if provided"""
         if isinstance(obj_in, dict):
-            update_data = obj_in
+            update_data = dict(obj_in)
         else:
             update_data = obj_in.model_dump(exclude_unset=True)
         
         # Hash password if provided
         if "password" in update_data and update_data["password"]:
-            hashed_password = get_password_hash(update_data["password"])
+            hashed_password = password_hasher.hash(update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
         
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
+        update_data = self._bump_token_version(db_obj, update_data)
+        changed = self._changed_values(db_obj, update_data)
+        stats_affected = any(field in changed for field in SYSTEM_STATS_FIELDS)
+        search_affected = any(field in changed for field in SEARCH_FIELDS)
+        db_obj = super().update(db, db_obj=db_obj, obj_in=update_data)
+        user_cache.invalidate(db_obj.id)
+        if stats_affected:
+            system_stats.invalidate()
+        if search_affected:
+            user_search.add(db_obj.id, db_obj.email, db_obj.full_name)
+        return db_obj
+
+    def revoke_tokens(self, db: Session, *, id: int) -> None:
+        """Revoke every access and refresh token issued to a user"""
+        db.execute(self._revoke_tokens_stmt(id))
+        db.commit()
+        user_cache.invalidate(id)
+
+    def remove(self, db: Session, *, id: int) -> User:
+        """Delete user and drop their cached principal"""
+        db_obj = db.get(User, id)
+        db.delete(db_obj)
+        # Same transaction as the delete, so the daily count cannot drift
+        db.execute(growth_stats.user_deleted_stmt(db_obj.created_at))
+        db.commit()
+        user_cache.invalidate(id)
+        system_stats.invalidate()  # Their content went with them
+        user_search.remove(id)
+        return db_obj
+
+    async def aget_by_email(self, db: AsyncSession, *, email: str) -> Optional[User]:
+        """Get user by email"""
+        result = await db.execute(select(User).where(User.email == email))
+        return result.scalars().first()
+
+    async def acreate(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
+        """Create new user with hashed password"""
+        db_obj = await db.scalar(self._insert_stmt({
+            "email": obj_in.email,
+            "hashed_password": await password_hasher.ahash(obj_in.password),
+            "full_name": obj_in.full_name,
+            "is_active": True,
+        }))
+        await db.commit()
+        system_stats.record_user_created(db_obj)
+        user_search.add(db_obj.id, db_obj.email, db_obj.full_name)
+        return db_obj
+
+    async def aauthenticate(
+        self, db: AsyncSession, *, email: str, password: str
+    ) -> Optional[User]:
+        """Authenticate a user"""
+        user = await self.aget_by_email(db, email=email)
+        if not user:
+            return None
+        if not await self.acheck_password(db, user=user, password=password):
+            return None
+        return user
+
+    async def acheck_password(
+        self, db: AsyncSession, *, user: User, password: str, rehash: bool = True
+    ) -> bool:
+        """
+        Verify a user's password, upgrading an outdated hash in place.
+        Pass rehash=False when the password is about to be replaced anyway.
+        """
+        if not has_usable_password(user.hashed_password):
+            return False
+        matches, new_hash = await password_hasher.averify_and_update(
+            password, user.hashed_password
+        )
+        if matches and new_hash and rehash:
+            # Same password, so skip CRUDUser.aupdate and its token revocation
+            await super().aupdate(db, db_obj=user, obj_in={"hashed_password": new_hash})
+        return matches
+
+    async def aprovision_oauth(
+        self,
+        db: AsyncSession,
+        *,
+        email: str,
+        full_name: Optional[str] = None,
+        avatar_url: Optional[str] = None
+    ) -> User:
+        """Create or update a passwordless user verified by an OAuth provider"""
+        stmt = self._provision_oauth_stmt(
+            db.get_bind().dialect.name, email=email, full_name=full_name, avatar_url=avatar_url
+        )
+        db_obj = await db.scalar(stmt, execution_options={"populate_existing": True})
+        await db.commit()
+        # The upsert may have changed an existing user's cached principal
+        user_cache.invalidate(db_obj.id)
+        # The upsert does not say whether it inserted, so recount
+        system_stats.invalidate()
+        user_search.add(db_obj.id, db_obj.email, db_obj.full_name)
+        return db_obj
 
+    async def aget_principal(
+        self, db: AsyncSession, *, id: int
+    ) -> Optional[UserPrincipal]:
+        """Load just the columns authorisation needs"""
+        row = (await db.execute(self._principal_stmt(id))).first()
+        return UserPrincipal.from_user(row) if row else None
+
+    async def aupdate(
+        self, db: AsyncSession, *, db_obj: User, obj_in: UserUpdate | dict
+    ) -> User:
+        """Update user, hash password if provided"""
+        if isinstance(obj_in, dict):
+            update_data = dict(obj_in)
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+
+        # Hash password if provided
+        if "password" in update_data and update_data["password"]:
+            hashed_password = await password_hasher.ahash(update_data["password"])
+            del update_data["password"]
+            update_data["hashed_password"] = hashed_password
+
+        update_data = self._bump_token_version(db_obj, update_data)
+        changed = self._changed_values(db_obj, update_data)
+        stats_affected = any(field in changed for field in SYSTEM_STATS_FIELDS)
+        search_affected = any(field in changed for field in SEARCH_FIELDS)
+        db_obj = await super().aupdate(db, db_obj=db_obj, obj_in=update_data)
+        user_cache.invalidate(db_obj.id)
+        if stats_affected:
+            system_stats.invalidate()
+        if search_affected:
+            user_search.add(db_obj.id, db_obj.email, db_obj.full_name)
+        return db_obj
+
+    async def arevoke_tokens(self, db: AsyncSession, *, id: int) -> None:
+        """Revoke every access and refresh token issued to a user"""
+        await db.execute(self._revoke_tokens_stmt(id))
+        await db.commit()
+        user_cache.invalidate(id)
+
+    async def aremove(self, db: AsyncSession, *, id: int) -> User:
+        """Delete user and drop their cached principal"""
+        db_obj = await db.get(User, id)
+        await db.delete(db_obj)
+        # Same transaction as the delete, so the daily count cannot drift
+        await db.execute(growth_stats.user_deleted_stmt(db_obj.created_at))
+        await db.commit()
+        user_cache.invalidate(id)
+        system_stats.invalidate()  # Their content went with them
+        user_search.remove(id)
+        return db_obj
 
 
 # Create instance
@@ -1,17 +1,93 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool_metrics import get_pool_kwargs, instrument_engine
+from app.db.routing import RoutingSession
+
+
+def get_async_database_url(url: str) -> str:
+    """
+    Map a sync database URL onto a driver that supports asyncio.
+
+    psycopg 3 serves both sync and async from the same dialect name, so
+    Postgres URLs only need their driver normalised; SQLite uses aiosqlite.
+    """
+    if url.startswith("sqlite+aiosqlite://") or "+asyncpg" in url:
+        return url
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return url.replace(prefix, "postgresql+psycopg://", 1)
+    return url
+
 
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,  # Enable connection health checks
-    echo=settings.ENVIRONMENT == "development"  # Log SQL queries in dev
+    echo=settings.ENVIRONMENT == "development",  # Log SQL queries in dev
+    **get_pool_kwargs(settings.DATABASE_URL)
+)
+
+# Create asyncio engine for routes that run on the event loop
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=settings.ENVIRONMENT == "development",
+    **get_pool_kwargs(ASYNC_DATABASE_URL, is_async=True)
 )
 
+# Optional read replicas, one sync and one async engine per URL
+replica_engines = [
+    create_engine(url, **get_pool_kwargs(url))
+    for url in settings.DATABASE_REPLICA_URLS
+]
+async_replica_engines = [
+    create_async_engine(
+        get_async_database_url(url),
+        **get_pool_kwargs(get_async_database_url(url), is_async=True)
+    )
+    for url in settings.DATABASE_REPLICA_URLS
+]
+
+# Collect pool metrics for every engine (see /admin/stats/pool)
+instrument_engine(engine, "primary")
+instrument_engine(async_engine.sync_engine, "async")
+for i, replica in enumerate(replica_engines):
+    instrument_engine(replica, f"replica-{i}")
+for i, replica in enumerate(async_replica_engines):
+    instrument_engine(replica.sync_engine, f"async-replica-{i}")
+
+# With replicas configured, sessions route SELECTs to them and keep writes
+# (and the writing user's follow-up reads) on the primary.
+if replica_engines:
+    session_kwargs = {"class_": RoutingSession, "primary": engine, "replicas": replica_engines}
+    async_session_kwargs = {
+        "sync_session_class": RoutingSession,
+        "primary": async_engine.sync_engine,
+        "replicas": [replica.sync_engine for replica in async_replica_engines],
+    }
+else:
+    session_kwargs = {"bind": engine}
+    async_session_kwargs = {"bind": async_engine}
+
 # Create SessionLocal class for database sessions
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Instances stay loaded after commit; write paths populate them via
+# RETURNING rather than reloading with a refresh SELECT.
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, **session_kwargs
+)
+
+# Async sessions must not expire on commit: attribute access after commit
+# would otherwise trigger implicit IO outside of an awaited call.
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+    **async_session_kwargs
+)
 
 # Create Base class for models
 Base = declarative_base()
@@ -27,3 +103,12 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Dependency for getting an async database session.
+    Yields an AsyncSession and ensures it's closed after use.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
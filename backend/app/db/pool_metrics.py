@@ -0,0 +1,171 @@
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+
+from app.core.config import settings
+
+
+class PoolMetrics:
+    """
+    Counters for a single engine's connection pool.
+
+    Fed by SQLAlchemy pool/engine events plus the checkout timing recorded by
+    the instrumented pool classes below.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.pool: Pool | None = None
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.pre_ping_failures = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+
+    def record_checkout_wait(self, seconds: float, timed_out: bool = False) -> None:
+        """Record how long a caller waited for a pooled connection"""
+        with self._lock:
+            self.checkout_wait_total += seconds
+            if seconds > self.checkout_wait_max:
+                self.checkout_wait_max = seconds
+            if timed_out:
+                self.checkout_timeouts += 1
+
+    def _incr(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a point-in-time view of the pool state and counters"""
+        pool = self.pool
+        is_queue_pool = isinstance(pool, QueuePool)
+        with self._lock:
+            checkouts = self.checkouts
+            return {
+                "name": self.name,
+                "pool_class": type(pool).__name__ if pool is not None else None,
+                "size": pool.size() if is_queue_pool else 0,
+                "checked_out": pool.checkedout() if is_queue_pool else checkouts - self.checkins,
+                "checked_in": pool.checkedin() if is_queue_pool else 0,
+                "overflow": pool.overflow() if is_queue_pool else 0,
+                "connects": self.connects,
+                "checkouts": checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "pre_ping_failures": self.pre_ping_failures,
+                "checkout_timeouts": self.checkout_timeouts,
+                "checkout_wait_avg_ms": (
+                    self.checkout_wait_total / checkouts * 1000 if checkouts else 0.0
+                ),
+                "checkout_wait_max_ms": self.checkout_wait_max * 1000,
+            }
+
+
+# Registry of metrics by engine name ("primary", "async", ...)
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+class _TimedCheckoutMixin:
+    """Time the blocking part of a pool checkout (waiting for a free slot)"""
+
+    _metrics: PoolMetrics | None = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            if self._metrics is not None:
+                self._metrics.record_checkout_wait(
+                    time.perf_counter() - start, timed_out=timed_out
+                )
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """QueuePool that reports checkout wait time"""
+
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that reports checkout wait time"""
+
+
+def instrument_engine(engine: Engine, name: str) -> PoolMetrics:
+    """
+    Attach pool and error listeners to a sync engine (pass
+    ``async_engine.sync_engine`` for asyncio engines).
+    """
+    metrics = PoolMetrics(name)
+    metrics.pool = engine.pool
+    if isinstance(engine.pool, _TimedCheckoutMixin):
+        engine.pool._metrics = metrics
+
+    @event.listens_for(engine.pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics._incr("connects")
+
+    @event.listens_for(engine.pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics._incr("checkouts")
+
+    @event.listens_for(engine.pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        metrics._incr("checkins")
+
+    @event.listens_for(engine.pool, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics._incr("invalidations")
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context):
+        if getattr(context, "is_pre_ping", False):
+            metrics._incr("pre_ping_failures")
+
+    pool_metrics[name] = metrics
+    return metrics
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Snapshot every instrumented engine's pool"""
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
+
+
+def get_pool_kwargs(url: str, *, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Build ``create_engine`` pool arguments from settings.
+
+    ``DB_USE_NULL_POOL`` disables client-side pooling for PgBouncer in
+    transaction mode; psycopg's server-side prepared statements are turned
+    off in that case as well, since they do not survive a pooler swapping
+    backends between transactions.
+    """
+    if settings.DB_USE_NULL_POOL:
+        kwargs: Dict[str, Any] = {"poolclass": NullPool}
+        if "+psycopg" in url and "+psycopg2" not in url:
+            kwargs["connect_args"] = {"prepare_threshold": None}
+        return kwargs
+
+    kwargs = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    # In-memory SQLite uses a single shared connection; leave its pool alone
+    if url.startswith("sqlite") and (":memory:" in url or url.rstrip("/").endswith(":")):
+        return kwargs
+
+    kwargs.update(
+        poolclass=InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return kwargs
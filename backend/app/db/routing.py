@@ -0,0 +1,89 @@
+import random
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+
+# Id of the user the current request is acting for; set by
+# app.api.deps.get_current_user so routing works without endpoint changes.
+current_user_id: ContextVar[Optional[int]] = ContextVar("current_user_id", default=None)
+
+
+class ReadYourWritesTracker:
+    """
+    Remembers which users wrote recently so their reads can be pinned to the
+    primary until replicas have caught up.
+
+    State is per process, which matches how sessions are scoped; a user
+    bouncing between workers may briefly see replica lag.
+    """
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._until: Dict[int, float] = {}
+
+    def mark_write(self, user_id: int) -> None:
+        """Pin a user's reads to the primary for the configured window"""
+        now = time.monotonic()
+        with self._lock:
+            self._until[user_id] = now + self.window_seconds
+            # Opportunistically drop expired entries to keep the map bounded
+            if len(self._until) > 1024:
+                self._until = {
+                    uid: until for uid, until in self._until.items() if until > now
+                }
+
+    def is_pinned(self, user_id: Optional[int]) -> bool:
+        """Check whether a user's reads must still go to the primary"""
+        if user_id is None:
+            return False
+        until = self._until.get(user_id)
+        return until is not None and until > time.monotonic()
+
+
+read_your_writes = ReadYourWritesTracker(settings.READ_YOUR_WRITES_SECONDS)
+
+
+class RoutingSession(Session):
+    """
+    Session that sends plain SELECTs to a replica and everything else
+    (flushes, INSERT/UPDATE/DELETE, SELECT ... FOR UPDATE, raw text) to the
+    primary.
+
+    Once a session has written, it stays on the primary for the rest of its
+    life, and on commit the acting user is pinned to the primary for
+    ``READ_YOUR_WRITES_SECONDS``.
+    """
+
+    def __init__(self, *args, primary: Engine, replicas: Sequence[Engine] = (), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.has_written = False
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        if self._flushing or not isinstance(clause, Select) or clause._for_update_arg is not None:
+            self.has_written = True
+            return self.primary
+        if (
+            not self.replicas
+            or self.has_written
+            or read_your_writes.is_pinned(current_user_id.get())
+        ):
+            return self.primary
+        return random.choice(self.replicas)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _pin_user_after_commit(session: RoutingSession) -> None:
+    user_id = current_user_id.get()
+    if session.has_written and user_id is not None:
+        read_your_writes.mark_write(user_id)
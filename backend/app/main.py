@@ -1,7 +1,51 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.core.config import settings
+from app.core.http_client import close_http_client
+from app.core.password_hasher import PasswordHasherBusy
+from app.core.rate_limit import RateLimitMiddleware
 from app.api.router import api_router
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.db.base import SessionLocal
+from app.services.email_service import email_service
+from app.services.otp_service import run_otp_sweeper
+from app.services.token_service import token_service
+from app.services.user_search import run_user_search_rebuilder, user_search
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Seed the revoked refresh-token filter and the user search index
+    db = SessionLocal()
+    try:
+        token_service.load_revocations(db)
+        user_search.rebuild(db)
+    finally:
+        db.close()
+    
+    sweeper = None
+    if settings.OTP_SWEEP_INTERVAL_SECONDS > 0:
+        sweeper = asyncio.create_task(run_otp_sweeper())
+    search_rebuilder = None
+    if settings.USER_SEARCH_REBUILD_SECONDS > 0:
+        search_rebuilder = asyncio.create_task(run_user_search_rebuilder())
+    # Deliver queued email in the background; handlers only enqueue
+    email_workers = [
+        asyncio.create_task(email_service.queue.run_worker())
+        for _ in range(settings.EMAIL_WORKERS)
+    ]
+    yield
+    if sweeper is not None:
+        sweeper.cancel()
+    if search_rebuilder is not None:
+        search_rebuilder.cancel()
+    for worker in email_workers:
+        worker.cancel()
+    await close_http_client()
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -9,6 +53,7 @@ app = FastAPI(
     version=settings.VERSION,
     description=settings.DESCRIPTION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Debug: Print CORS origins at startup
@@ -17,6 +62,19 @@ print("CORS ORIGINS CONFIGURED:")
 print(settings.BACKEND_CORS_ORIGINS)
 print("=" * 50)
 
+# Throttle credential and OTP endpoints; added before CORS so rejections
+# still carry CORS headers
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        paths=[
+            f"{settings.API_V1_STR}/auth/login",
+            f"{settings.API_V1_STR}/auth/register/request-otp",
+            f"{settings.API_V1_STR}/auth/forgot-password",
+            f"{settings.API_V1_STR}/auth/verify-otp",
+        ],
+    )
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -24,12 +82,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "Retry-After"],
 )
 
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    """Shed auth load instead of queueing without bound"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.get("/")
 def root():
     """Root endpoint"""
@@ -7,6 +7,9 @@ from app.models.goal import Goal
 from app.models.media import Media
 from app.models.otp import OTP
 from app.models.subscription import Subscription
+from app.models.revoked_token import RevokedToken
+from app.models.email_outbox import EmailOutbox, EmailDeadLetter
+from app.models.daily_user_stats import DailyUserStats
 
-__all__ = ["User", "Category", "Achievement", "Skill", "Goal", "Media", "OTP", "Subscription"]
+__all__ = ["User", "Category", "Achievement", "Skill", "Goal", "Media", "OTP", "Subscription", "RevokedToken", "EmailOutbox", "EmailDeadLetter", "DailyUserStats"]
 
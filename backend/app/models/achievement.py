@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, Boolean, Text, DateTime
+from sqlalchemy import Column, String, Integer, ForeignKey, Boolean, Text, DateTime, Index, text
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from app.db.base_class import BaseModel
@@ -9,6 +9,17 @@ class Achievement(Base, BaseModel):
     Achievement model for storing user achievements.
     """
     __tablename__ = "achievements"
+    __table_args__ = (
+        # Keyset pagination: per-user lists, per-category lists, public feed
+        Index("ix_achievements_user_id_id", "user_id", "id"),
+        Index("ix_achievements_user_id_category_id_id", "user_id", "category_id", "id"),
+        Index(
+            "ix_achievements_public_id",
+            "id",
+            postgresql_where=text("is_public"),
+            sqlite_where=text("is_public"),
+        ),
+    )
     
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
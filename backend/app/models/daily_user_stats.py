@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, Date
+from app.db.base import Base
+from app.db.base_class import BaseModel
+
+
+class DailyUserStats(Base, BaseModel):
+    """
+    Sign-ups per completed UTC day, rolled up from users for the admin
+    growth chart. Every day up to the latest row has one (possibly zero).
+    """
+    __tablename__ = "daily_user_stats"
+    
+    day = Column(Date, unique=True, index=True, nullable=False)
+    new_users = Column(Integer, default=0, nullable=False)
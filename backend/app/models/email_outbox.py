@@ -0,0 +1,35 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from app.db.base import Base
+from app.db.base_class import BaseModel
+
+
+class EmailOutbox(Base, BaseModel):
+    """
+    Outbound email waiting to be sent by the background email workers.
+    Rows are deleted once sent or moved to email_dead_letters.
+    """
+    __tablename__ = "email_outbox"
+    
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=True)
+    html_content = Column(Text, nullable=True)
+    template_id = Column(String, nullable=True)
+    template_data = Column(Text, nullable=True)  # JSON
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    locked_until = Column(DateTime, nullable=True)  # Lease held by a worker
+    last_error = Column(Text, nullable=True)
+
+
+class EmailDeadLetter(Base, BaseModel):
+    """Outbound email that exhausted its retries"""
+    __tablename__ = "email_dead_letters"
+    
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=True)
+    html_content = Column(Text, nullable=True)
+    template_id = Column(String, nullable=True)
+    template_data = Column(Text, nullable=True)  # JSON
+    attempts = Column(Integer, nullable=False)
+    last_error = Column(Text, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, Text, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, String, Integer, ForeignKey, Index, Text, DateTime, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from app.db.base_class import BaseModel
@@ -18,6 +18,10 @@ class Goal(Base, BaseModel):
     Goal model for tracking user goals and progress.
     """
     __tablename__ = "goals"
+    __table_args__ = (
+        # Keyset pagination of a user's goals
+        Index("ix_goals_user_id_id", "user_id", "id"),
+    )
     
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     
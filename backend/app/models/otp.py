@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime, timedelta
 from app.db.base import Base
@@ -10,6 +10,20 @@ class OTP(Base, BaseModel):
     OTP model for email/SMS verification.
     """
     __tablename__ = "otps"
+    __table_args__ = (
+        # Lookups only ever target unused codes, so index just those rows.
+        # Predicates are spelled the way each dialect renders ~OTP.is_used.
+        Index(
+            "ix_otps_user_id_purpose_code_unused", "user_id", "purpose", "code",
+            postgresql_where=text("NOT is_used"), sqlite_where=text("is_used = 0"),
+        ),
+        Index(
+            "ix_otps_email_purpose_code_unused", "email", "purpose", "code",
+            postgresql_where=text("NOT is_used"), sqlite_where=text("is_used = 0"),
+        ),
+        # Range scans for the expiry sweeper
+        Index("ix_otps_expires_at", "expires_at"),
+    )
     
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)  # Nullable for registration
     email = Column(String, nullable=True)  # For registration before user exists
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from app.db.base import Base
+from app.db.base_class import BaseModel
+
+
+class RevokedToken(Base, BaseModel):
+    """
+    Refresh token ids that may no longer be used.
+
+    Rows are written when a refresh token is rotated or logged out and can
+    be dropped once ``expires_at`` passes, since the token itself is dead.
+    """
+    __tablename__ = "revoked_tokens"
+    
+    jti = Column(String(64), unique=True, index=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy import Column, String, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from app.db.base_class import BaseModel
@@ -9,6 +9,10 @@ class Skill(Base, BaseModel):
     Skill model for tracking user skills and proficiency.
     """
     __tablename__ = "skills"
+    __table_args__ = (
+        # Keyset pagination of a user's skills
+        Index("ix_skills_user_id_id", "user_id", "id"),
+    )
     
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     
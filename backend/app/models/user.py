@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Text, DateTime
+from sqlalchemy import Column, String, Boolean, Text, DateTime, Integer, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from app.db.base_class import BaseModel
@@ -9,6 +9,10 @@ class User(Base, BaseModel):
     User model for authentication and profile management.
     """
     __tablename__ = "users"
+    __table_args__ = (
+        # Range scans for today's sign-ups and the growth rollup
+        Index("ix_users_created_at", "created_at"),
+    )
     
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
@@ -17,6 +21,9 @@ class User(Base, BaseModel):
     bio = Column(Text, nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
     is_superuser = Column(Boolean, default=False, nullable=False)
+    # Bumped on bans, role/tier changes and password resets to revoke
+    # previously issued access tokens
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
     
     # Subscription & Verification
     subscription_tier = Column(String, default="free", nullable=False)  # "free" or "pro"
@@ -28,6 +28,11 @@ class AchievementUpdate(BaseModel):
     is_public: Optional[bool] = None
 
 
+class AchievementBatchUpdate(AchievementUpdate):
+    """Schema for one item of a batch achievement update"""
+    id: int
+
+
 class Achievement(AchievementBase):
     """Schema for achievement response"""
     id: int
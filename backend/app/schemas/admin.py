@@ -25,6 +25,16 @@ class UserAdmin(BaseModel):
         from_attributes = True
 
 
+class UserSuggestion(BaseModel):
+    """Autocomplete entry for admin user lookup"""
+    id: int
+    email: str
+    full_name: Optional[str]
+    
+    class Config:
+        from_attributes = True
+
+
 class UserAdminUpdate(BaseModel):
     """Schema for admin to update user"""
     is_active: Optional[bool] = None
@@ -46,6 +56,48 @@ class SystemStats(BaseModel):
     users_created_today: int
 
 
+class PoolStats(BaseModel):
+    """Connection pool state and counters for one engine"""
+    name: str
+    pool_class: Optional[str] = None
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    connects: int
+    checkouts: int
+    checkins: int
+    invalidations: int
+    pre_ping_failures: int
+    checkout_timeouts: int
+    checkout_wait_avg_ms: float
+    checkout_wait_max_ms: float
+
+
+class UserCacheStats(BaseModel):
+    """Authenticated-user cache counters for this process"""
+    size: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    invalidations: int
+
+
+class PasswordHasherStats(BaseModel):
+    """Password-hashing pool counters for this process"""
+    workers: int
+    max_queue: int
+    queue_depth: int
+    in_flight: int
+    completed: int
+    rejected: int
+    wait_avg_ms: float
+    wait_max_ms: float
+
+
 class GrowthDataPoint(BaseModel):
     """Single data point for growth chart"""
     date: str  # YYYY-MM-DD format
@@ -27,6 +27,11 @@ class GoalUpdate(BaseModel):
     progress_percentage: Optional[int] = Field(None, ge=0, le=100)
 
 
+class GoalBatchUpdate(GoalUpdate):
+    """Schema for one item of a batch goal update"""
+    id: int
+
+
 class Goal(GoalBase):
     """Schema for goal response"""
     id: int
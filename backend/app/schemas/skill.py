@@ -22,6 +22,11 @@ class SkillUpdate(BaseModel):
     category: Optional[str] = None
 
 
+class SkillBatchUpdate(SkillUpdate):
+    """Schema for one item of a batch skill update"""
+    id: int
+
+
 class Skill(SkillBase):
     """Schema for skill response"""
     id: int
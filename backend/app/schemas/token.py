@@ -5,9 +5,24 @@ from pydantic import BaseModel
 class Token(BaseModel):
     """JWT Token response schema"""
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str = "bearer"
 
 
+class RefreshTokenRequest(BaseModel):
+    """Body for /auth/refresh and /auth/logout"""
+    refresh_token: str
+
+
 class TokenPayload(BaseModel):
     """JWT Token payload schema"""
     sub: Optional[int] = None
+    # Principal claims; absent on tokens issued before they were added
+    ver: Optional[int] = None
+    active: Optional[bool] = None
+    admin: Optional[bool] = None
+    tier: Optional[str] = None
+    # Set on refresh tokens only
+    typ: Optional[str] = None
+    jti: Optional[str] = None
+    exp: Optional[int] = None
@@ -0,0 +1,159 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from typing import List
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.models.email_outbox import EmailDeadLetter, EmailOutbox
+from app.services.email_transport import EmailMessage, EmailTransport
+
+
+class EmailQueue:
+    """
+    Durable outbound email queue backed by the email_outbox table.
+
+    Request handlers only enqueue; background workers claim due messages in
+    batches under a lease, send them through the transport, and retry
+    failures with exponential backoff until EMAIL_MAX_ATTEMPTS, after which
+    the message moves to email_dead_letters.
+    """
+    
+    LEASE_SECONDS = 120
+    MAX_BACKOFF_SECONDS = 3600
+    
+    def __init__(self, transport: EmailTransport):
+        self.transport = transport
+    
+    @staticmethod
+    def _row(message: EmailMessage, now: datetime) -> dict:
+        return {
+            "to_email": message.to_email,
+            "subject": message.subject,
+            "html_content": message.html_content,
+            "template_id": message.template_id,
+            "template_data": json.dumps(message.template_data),
+            "attempts": 0,
+            "next_attempt_at": now,
+        }
+    
+    def enqueue(self, message: EmailMessage, db: Session = None) -> None:
+        """Persist a message for delivery; commits its own session if none is given"""
+        self.enqueue_many([message], db)
+    
+    def enqueue_many(self, messages: List[EmailMessage], db: Session = None) -> None:
+        """Persist a batch of messages with a single multi-row insert"""
+        if not messages:
+            return
+        now = datetime.utcnow()
+        rows = [self._row(message, now) for message in messages]
+        own_session = db is None
+        if own_session:
+            db = SessionLocal()
+        try:
+            db.execute(insert(EmailOutbox), rows)
+            db.commit()
+        finally:
+            if own_session:
+                db.close()
+    
+    def claim_batch(self, db: Session, batch_size: int) -> List[EmailOutbox]:
+        """
+        Lease up to ``batch_size`` due messages to the calling worker.
+
+        The lease is taken by a single UPDATE ... RETURNING whose WHERE
+        re-checks that the row is unleased, so two workers can never both
+        claim a message, even on SQLite where FOR UPDATE is a no-op.
+        """
+        now = datetime.utcnow()
+        unleased = or_(EmailOutbox.locked_until.is_(None), EmailOutbox.locked_until < now)
+        due = (
+            select(EmailOutbox.id)
+            .where(EmailOutbox.next_attempt_at <= now, unleased)
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(batch_size)
+            # Lets PostgreSQL workers pass over each other's rows without waiting
+            .with_for_update(skip_locked=True)
+        )
+        rows = list(db.scalars(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(due.scalar_subquery()), unleased)
+            .values(locked_until=now + timedelta(seconds=self.LEASE_SECONDS))
+            .returning(EmailOutbox)
+            .execution_options(synchronize_session=False)
+        ).all())
+        db.commit()
+        return rows
+    
+    def _fail(self, db: Session, row: EmailOutbox, error: Exception) -> None:
+        attempts = row.attempts + 1
+        if attempts >= settings.EMAIL_MAX_ATTEMPTS:
+            db.execute(insert(EmailDeadLetter).values(
+                to_email=row.to_email,
+                subject=row.subject,
+                html_content=row.html_content,
+                template_id=row.template_id,
+                template_data=row.template_data,
+                attempts=attempts,
+                last_error=str(error),
+            ))
+            db.execute(delete(EmailOutbox).where(EmailOutbox.id == row.id))
+            print(f"⚠️  Email to {row.to_email} dead-lettered after {attempts} attempts: {error}")
+            return
+        backoff = min(
+            settings.EMAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1), self.MAX_BACKOFF_SECONDS
+        )
+        db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id == row.id)
+            .values(
+                attempts=attempts,
+                next_attempt_at=datetime.utcnow() + timedelta(seconds=backoff),
+                locked_until=None,
+                last_error=str(error),
+            )
+        )
+    
+    def process_batch(self, batch_size: int) -> int:
+        """Claim and send one batch; returns how many messages were claimed"""
+        db = SessionLocal()
+        try:
+            rows = self.claim_batch(db, batch_size)
+            if not rows:
+                return 0
+            messages = [
+                EmailMessage(
+                    to_email=row.to_email,
+                    subject=row.subject,
+                    html_content=row.html_content,
+                    template_id=row.template_id,
+                    template_data=json.loads(row.template_data) if row.template_data else {},
+                )
+                for row in rows
+            ]
+            sent_ids = []
+            for row, error in zip(rows, self.transport.send_batch(messages)):
+                if error is None:
+                    sent_ids.append(row.id)
+                else:
+                    self._fail(db, row, error)
+            if sent_ids:
+                db.execute(delete(EmailOutbox).where(EmailOutbox.id.in_(sent_ids)))
+            db.commit()
+            return len(rows)
+        finally:
+            db.close()
+    
+    async def run_worker(self) -> None:
+        """Worker loop; several run concurrently from the app lifespan"""
+        while True:
+            try:
+                claimed = await run_in_threadpool(self.process_batch, settings.EMAIL_BATCH_SIZE)
+            except Exception as e:
+                print(f"⚠️  Email worker error: {e}")
+                claimed = 0
+            # Drain back-to-back while there is work, otherwise poll
+            if claimed < settings.EMAIL_BATCH_SIZE:
+                await asyncio.sleep(settings.EMAIL_POLL_INTERVAL_SECONDS)
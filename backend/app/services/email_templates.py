@@ -0,0 +1,220 @@
+import html
+import keyword
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from app.services.email_transport import EmailMessage
+
+
+class EmailTemplate:
+    """
+    An email body compiled once into a function that builds it with a
+    single f-string.
+
+    Each ``{{field}}`` becomes a keyword argument of that function and the
+    markup between fields is bound as constants, so rendering is one
+    f-string build plus escaping of the per-recipient values; nothing is
+    looked up or re-parsed per send.
+    """
+    
+    FIELD = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+    
+    def __init__(self, name: str, subject: str, source: str):
+        self.name = name
+        self.subject = subject
+        # split() alternates literal text and field names
+        parts = self.FIELD.split(source)
+        self.fields: Tuple[str, ...] = tuple(dict.fromkeys(parts[1::2]))
+        self.render: Callable[..., str] = self._compile(parts)
+    
+    def _compile(self, parts: List[str]) -> Callable[..., str]:
+        for field in self.fields:
+            if not field.isidentifier() or keyword.iskeyword(field) or field.startswith("_"):
+                raise ValueError(f"Template {self.name!r} has an invalid field {field!r}")
+        namespace: Dict[str, Any] = {"_escape": _escape}
+        pieces = []
+        for index, part in enumerate(parts):
+            if index % 2:
+                pieces.append(f"{{_escape({part})}}")
+            elif part:
+                # Character references keep the markup ASCII (1 byte per
+                # character) even when it contains emoji
+                namespace[f"_text{index}"] = part.encode("ascii", "xmlcharrefreplace").decode("ascii")
+                pieces.append(f"{{_text{index}}}")
+        params = "".join(f'{field}="", ' for field in self.fields)
+        body = "".join(pieces)
+        source = f'def render(*, {params}**_unused):\n    return f"{body}"\n'
+        exec(compile(source, f"<email template {self.name}>", "exec"), namespace)
+        return namespace["render"]
+
+
+def _escape(value: Any) -> str:
+    text = value if value.__class__ is str else str(value)
+    # Most values need no escaping; skip html.escape's three replaces
+    if "&" in text or "<" in text or ">" in text:
+        return html.escape(text, quote=False)
+    return text
+
+
+def _greeting(user_name: Optional[str]) -> str:
+    return f" {user_name}" if user_name else ""
+
+
+class TemplateRegistry:
+    """Compiled templates by name; built once at import (startup)"""
+    
+    def __init__(self):
+        self._templates: Dict[str, EmailTemplate] = {}
+    
+    def register(self, name: str, subject: str, source: str) -> EmailTemplate:
+        template = EmailTemplate(name, subject, source)
+        self._templates[name] = template
+        return template
+    
+    def get(self, name: str) -> EmailTemplate:
+        return self._templates[name]
+    
+    def render(
+        self, name: str, to_email: str, user_name: Optional[str] = None, **fields: Any
+    ) -> EmailMessage:
+        """Render one message; ``fields`` are also kept as its template_data"""
+        template = self._templates[name]
+        return EmailMessage(
+            to_email,
+            template.subject,
+            template.render(greeting=_greeting(user_name), **fields),
+            None,
+            fields,
+        )
+    
+    def render_batch(self, name: str, recipients: Iterable[Dict[str, Any]]) -> List[EmailMessage]:
+        """
+        Pre-render personalised messages for a bulk send. Each recipient is a
+        dict with ``to_email``, optional ``user_name`` and the template fields.
+        """
+        template = self._templates[name]
+        render = template.render
+        subject = template.subject
+        messages = []
+        append = messages.append
+        for recipient in recipients:
+            fields = dict(recipient)
+            to_email = fields.pop("to_email")
+            greeting = _greeting(fields.pop("user_name", None))
+            append(EmailMessage(to_email, subject, render(greeting=greeting, **fields), None, fields))
+        return messages
+
+
+PASSWORD_RESET_OTP_HTML = """\
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+        .content { background: #f9fafb; padding: 30px; border-radius: 0 0 10px 10px; }
+        .otp-box { background: white; border: 2px dashed #667eea; border-radius: 8px; padding: 20px; text-align: center; margin: 20px 0; }
+        .otp-code { font-size: 32px; font-weight: bold; color: #667eea; letter-spacing: 8px; }
+        .footer { text-align: center; margin-top: 20px; color: #666; font-size: 12px; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🔐 Password Reset</h1>
+        </div>
+        <div class="content">
+            <p>Hello{{greeting}},</p>
+            <p>You requested to reset your password for your Achievement Web account.</p>
+            <p>Here is your OTP code:</p>
+
+            <div class="otp-box">
+                <div class="otp-code">{{otp_code}}</div>
+            </div>
+
+            <p><strong>This code will expire in 10 minutes.</strong></p>
+            <p>If you did not request a password reset, please ignore this email.</p>
+
+            <div class="footer">
+                <p>© 2026 Achievement Web. All rights reserved.</p>
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+REGISTRATION_OTP_HTML = """\
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+        .content { background: #f9fafb; padding: 30px; border-radius: 0 0 10px 10px; }
+        .otp-box { background: white; border: 2px dashed #667eea; border-radius: 8px; padding: 20px; text-align: center; margin: 20px 0; }
+        .otp-code { font-size: 32px; font-weight: bold; color: #667eea; letter-spacing: 8px; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🎉 Welcome to Achievement Web!</h1>
+        </div>
+        <div class="content">
+            <p>Hello{{greeting}},</p>
+            <p>Thank you for registering! Please verify your email with the code below:</p>
+
+            <div class="otp-box">
+                <div class="otp-code">{{otp_code}}</div>
+            </div>
+
+            <p><strong>This code will expire in 10 minutes.</strong></p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+PASSWORD_RESET_CONFIRMATION_HTML = """\
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .success { background: #10b981; color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+        .content { background: #f9fafb; padding: 30px; border-radius: 0 0 10px 10px; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="success">
+            <h1>✅ Password Reset Successfully</h1>
+        </div>
+        <div class="content">
+            <p>Hello{{greeting}},</p>
+            <p>Your password has been reset successfully.</p>
+            <p>You can now log in with your new password.</p>
+            <p>If you did not make this change, please contact us immediately.</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+
+email_templates = TemplateRegistry()
+email_templates.register(
+    "password_reset_otp", "Your OTP Code - Password Reset", PASSWORD_RESET_OTP_HTML
+)
+email_templates.register(
+    "registration_otp", "Welcome! Verify Your Email", REGISTRATION_OTP_HTML
+)
+email_templates.register(
+    "password_reset_confirmation", "Password Reset Successful", PASSWORD_RESET_CONFIRMATION_HTML
+)
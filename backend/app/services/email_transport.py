@@ -0,0 +1,149 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+
+try:
+    from sendgrid import SendGridAPIClient
+    from sendgrid.helpers.mail import Mail, To
+    SENDGRID_AVAILABLE = True
+except ImportError:
+    SENDGRID_AVAILABLE = False
+
+
+@dataclass
+class EmailMessage:
+    """A rendered email, as stored in the outbox and handed to a transport"""
+    to_email: str
+    subject: Optional[str] = None
+    html_content: Optional[str] = None
+    template_id: Optional[str] = None
+    template_data: Dict[str, Any] = field(default_factory=dict)
+
+
+class EmailSendError(Exception):
+    """Raised by transports when a message was not accepted"""
+
+
+class EmailTransport(ABC):
+    """Delivers rendered messages; ``send_batch`` is what the email workers call"""
+    
+    @abstractmethod
+    def send(self, message: EmailMessage) -> None:
+        """Send one message, raising on failure"""
+    
+    def send_batch(self, messages: List[EmailMessage]) -> List[Optional[Exception]]:
+        """Send several messages; one result per message, None meaning sent"""
+        results: List[Optional[Exception]] = []
+        for message in messages:
+            try:
+                self.send(message)
+                results.append(None)
+            except Exception as e:
+                results.append(e)
+        return results
+
+
+class ConsoleTransport(EmailTransport):
+    """Development transport: prints messages instead of sending them"""
+    
+    def send(self, message: EmailMessage) -> None:
+        print(f"\n{'='*50}")
+        print(f"📧 EMAIL (Development Mode)")
+        print(f"To: {message.to_email}")
+        if message.subject:
+            print(f"Subject: {message.subject}")
+        if "otp_code" in message.template_data:
+            print(f"OTP Code: {message.template_data['otp_code']}")
+        print(f"{'='*50}\n")
+
+
+class SinkTransport(EmailTransport):
+    """Local stand-in for SendGrid that records messages, e.g. for tests"""
+    
+    def __init__(self):
+        self.sent: List[EmailMessage] = []
+    
+    def send(self, message: EmailMessage) -> None:
+        self.sent.append(message)
+
+
+class SendGridTransport(EmailTransport):
+    """Sends through the SendGrid API (blocking; run from the email workers)"""
+    
+    # SendGrid's per-request personalization limit
+    MAX_PERSONALIZATIONS = 1000
+    
+    def __init__(self, api_key: str, from_email: str):
+        self.client = SendGridAPIClient(api_key)
+        self.from_email = from_email
+    
+    def send(self, message: EmailMessage) -> None:
+        if message.template_id:
+            mail = Mail(from_email=self.from_email, to_emails=message.to_email)
+            mail.template_id = message.template_id
+            mail.dynamic_template_data = message.template_data
+        else:
+            mail = Mail(
+                from_email=self.from_email,
+                to_emails=message.to_email,
+                subject=message.subject,
+                html_content=message.html_content
+            )
+        self._post(mail)
+    
+    def _post(self, mail) -> None:
+        response = self.client.send(mail)
+        if response.status_code != 202:
+            raise EmailSendError(f"SendGrid returned {response.status_code}")
+    
+    def send_batch(self, messages: List[EmailMessage]) -> List[Optional[Exception]]:
+        """
+        Messages sharing a dynamic template go out as one API call with a
+        personalization per recipient; rendered HTML is sent one by one.
+        """
+        results: List[Optional[Exception]] = [None] * len(messages)
+        by_template: Dict[str, List[int]] = {}
+        for index, message in enumerate(messages):
+            if message.template_id:
+                by_template.setdefault(message.template_id, []).append(index)
+            else:
+                try:
+                    self.send(message)
+                except Exception as e:
+                    results[index] = e
+        
+        for template_id, indexes in by_template.items():
+            for start in range(0, len(indexes), self.MAX_PERSONALIZATIONS):
+                chunk = indexes[start:start + self.MAX_PERSONALIZATIONS]
+                mail = Mail(
+                    from_email=self.from_email,
+                    to_emails=[
+                        To(messages[i].to_email, dynamic_template_data=messages[i].template_data)
+                        for i in chunk
+                    ],
+                    is_multiple=True,
+                )
+                mail.template_id = template_id
+                try:
+                    self._post(mail)
+                except Exception as e:
+                    for i in chunk:
+                        results[i] = e
+        return results
+
+
+def get_email_transport(api_key: Optional[str], from_email: str) -> EmailTransport:
+    """
+    Transport chosen by EMAIL_TRANSPORT ("sendgrid", "console" or "sink");
+    when unset, SendGrid if it is installed and configured, else console.
+    """
+    name = settings.EMAIL_TRANSPORT
+    if not name:
+        name = "sendgrid" if (api_key and SENDGRID_AVAILABLE) else "console"
+    if name == "sendgrid":
+        return SendGridTransport(api_key, from_email)
+    if name == "sink":
+        return SinkTransport()
+    return ConsoleTransport()
+
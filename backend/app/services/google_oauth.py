@@ -0,0 +1,80 @@
+import asyncio
+import re
+import time
+from typing import Any, Dict, Optional
+from jose import JWTError, jwt
+from app.core.config import settings
+from app.core.http_client import get_http_client
+
+
+class GoogleOAuthService:
+    """
+    Google authorization-code exchange plus local id_token verification.
+
+    The id_token returned with the access token is verified against
+    Google's signing keys (JWKS), which are cached for as long as Google's
+    Cache-Control allows, so no userinfo round trip is needed per login.
+    """
+    
+    DEFAULT_JWKS_MAX_AGE = 3600
+    
+    def __init__(self):
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._keys_expire_at = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def exchange_code(self, code: str) -> Dict[str, Any]:
+        """Exchange an authorization code for Google's token response"""
+        response = await get_http_client().post(
+            settings.GOOGLE_TOKEN_URL,
+            data={
+                "code": code,
+                "client_id": settings.GOOGLE_CLIENT_ID,
+                "client_secret": settings.GOOGLE_CLIENT_SECRET,
+                "redirect_uri": settings.GOOGLE_REDIRECT_URI,
+                "grant_type": "authorization_code",
+            }
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    async def _fetch_keys(self) -> None:
+        response = await get_http_client().get(settings.GOOGLE_JWKS_URL)
+        response.raise_for_status()
+        max_age = re.search(r"max-age=(\d+)", response.headers.get("cache-control", ""))
+        ttl = int(max_age.group(1)) if max_age else self.DEFAULT_JWKS_MAX_AGE
+        self._keys = {key["kid"]: key for key in response.json()["keys"]}
+        self._keys_expire_at = time.monotonic() + ttl
+    
+    async def _get_key(self, kid: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Signing key by id, refreshing the JWKS when stale or on key rotation"""
+        if kid in self._keys and self._keys_expire_at > time.monotonic():
+            return self._keys[kid]
+        async with self._lock:
+            # Another request may have refreshed while we waited
+            if kid not in self._keys or self._keys_expire_at <= time.monotonic():
+                await self._fetch_keys()
+        return self._keys.get(kid)
+    
+    async def verify_id_token(
+        self, id_token: str, access_token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Verify signature, audience, issuer and expiry of a Google id_token.
+        Raises JWTError if the token is not valid.
+        """
+        header = jwt.get_unverified_header(id_token)
+        key = await self._get_key(header.get("kid"))
+        if key is None:
+            raise JWTError("Unknown id_token signing key")
+        return jwt.decode(
+            id_token,
+            key,
+            algorithms=["RS256"],
+            audience=settings.GOOGLE_CLIENT_ID,
+            issuer=settings.GOOGLE_ISSUERS,
+            access_token=access_token,
+        )
+
+
+google_oauth = GoogleOAuthService()
@@ -0,0 +1,129 @@
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import Date, func, select, type_coerce, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.daily_user_stats import DailyUserStats
+from app.models.user import User
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min)
+
+
+class GrowthStatsService:
+    """
+    User growth series for the admin chart.
+
+    Completed days are rolled up into daily_user_stats once, with a single
+    GROUP BY over just the new range of users, so a chart reads at most one
+    row per day plus a live count of today's sign-ups. Deleting a user
+    decrements their (already rolled up) day.
+    """
+    
+    def __init__(self):
+        # Last day known to be rolled up, so most requests skip the check
+        self._rolled_through: Optional[date] = None
+    
+    @staticmethod
+    def _day_expr(dialect_name: str):
+        if dialect_name == "postgresql":
+            return func.date_trunc("day", User.created_at).cast(Date)
+        return type_coerce(func.date(User.created_at), Date)
+    
+    def refresh(self, db: Session) -> None:
+        """Roll up every completed day not yet in daily_user_stats"""
+        yesterday = datetime.utcnow().date() - timedelta(days=1)
+        if self._rolled_through == yesterday:
+            return
+        
+        last = db.scalar(select(func.max(DailyUserStats.day)))
+        if last is None:
+            first_signup = db.scalar(select(func.min(User.created_at)))
+            first = first_signup.date() if first_signup else yesterday
+        else:
+            first = last + timedelta(days=1)
+        
+        if first <= yesterday:
+            dialect_name = db.get_bind().dialect.name
+            day = self._day_expr(dialect_name).label("day")
+            counts: Dict[date, int] = dict(db.execute(
+                select(day, func.count(User.id))
+                .where(
+                    User.created_at >= _day_start(first),
+                    User.created_at < _day_start(yesterday + timedelta(days=1)),
+                )
+                .group_by(day)
+            ).all())
+            # One row per day, zeros included, so max(day) is the watermark
+            now = datetime.utcnow()
+            rows = [
+                {
+                    "day": first + timedelta(days=offset),
+                    "new_users": counts.get(first + timedelta(days=offset), 0),
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for offset in range((yesterday - first).days + 1)
+            ]
+            insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+            # Another worker may be rolling up the same days
+            db.execute(
+                insert(DailyUserStats).on_conflict_do_nothing(index_elements=["day"]),
+                rows,
+            )
+            db.commit()
+        self._rolled_through = yesterday
+    
+    def series(self, db: Session, *, days: int) -> List[Dict]:
+        """Daily new and cumulative user counts for the last ``days`` days and today"""
+        self.refresh(db)
+        today = datetime.utcnow().date()
+        start = today - timedelta(days=days)
+        
+        cumulative = select(
+            DailyUserStats.day,
+            DailyUserStats.new_users,
+            func.sum(DailyUserStats.new_users)
+            .over(order_by=DailyUserStats.day)
+            .label("total_users"),
+        ).subquery()
+        rows = db.execute(
+            select(cumulative).where(cumulative.c.day >= start).order_by(cumulative.c.day)
+        ).all()
+        if rows:
+            running_total = rows[0].total_users - rows[0].new_users
+        else:
+            running_total = db.scalar(
+                select(func.coalesce(func.sum(DailyUserStats.new_users), 0))
+            )
+        by_day = {row.day: row.new_users for row in rows}
+        by_day[today] = db.scalar(
+            select(func.count(User.id)).where(User.created_at >= _day_start(today))
+        )
+        
+        series = []
+        for offset in range(days + 1):
+            day = start + timedelta(days=offset)
+            new_users = by_day.get(day, 0)
+            running_total += new_users
+            series.append({
+                "date": day.strftime("%Y-%m-%d"),
+                "new_users": new_users,
+                "total_users": running_total,
+            })
+        return series
+    
+    @staticmethod
+    def user_deleted_stmt(created_at: datetime):
+        """Keep a rolled-up day in step when one of its users is deleted"""
+        return (
+            update(DailyUserStats)
+            .where(DailyUserStats.day == created_at.date(), DailyUserStats.new_users > 0)
+            .values(new_users=DailyUserStats.new_users - 1)
+        )
+
+
+growth_stats = GrowthStatsService()
@@ -1,8 +1,12 @@
+import asyncio
 from datetime import datetime, timedelta
 from random import randint
 from sqlalchemy.orm import Session
-from app.models.otp import OTP
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.db.base import SessionLocal
 from app.models.user import User
+from app.services.otp_store import OTPRecord, OTPStore, get_otp_store
 
 
 class OTPService:
@@ -11,97 +15,78 @@ class OTPService:
     OTP_LENGTH = 6
     OTP_EXPIRY_MINUTES = 10
     
+    def __init__(self, store: OTPStore):
+        self.store = store
+    
     @staticmethod
     def generate_code() -> str:
         """Generate a random 6-digit OTP code"""
         return str(randint(100000, 999999))
     
-    @staticmethod
     def create_otp(
+        self,
         db: Session,
         user_id: int = None,
         email: str = None,
         purpose: str = "password_reset",
         delivery_method: str = "email"
-    ) -> OTP:
+    ) -> OTPRecord:
         """Create and store an OTP for a user or email"""
         if user_id is None and email is None:
             raise ValueError("Either user_id or email must be provided")
         
-        # Invalidate any existing OTPs for this purpose
-        query = db.query(OTP).filter(
-            OTP.purpose == purpose,
-            OTP.is_used == False
-        )
-        if user_id:
-            query = query.filter(OTP.user_id == user_id)
-        elif email:
-            query = query.filter(OTP.email == email)
-        
-        query.update({"is_used": True})
-        
-        # Generate new OTP
-        code = OTPService.generate_code()
-        expires_at = datetime.utcnow() + timedelta(minutes=OTPService.OTP_EXPIRY_MINUTES)
-        
-        otp = OTP(
+        record = OTPRecord(
+            code=self.generate_code(),
+            purpose=purpose,
+            expires_at=datetime.utcnow() + timedelta(minutes=self.OTP_EXPIRY_MINUTES),
             user_id=user_id,
             email=email,
-            code=code,
-            purpose=purpose,
-            delivery_method=delivery_method,
-            expires_at=expires_at,
-            is_used=False
         )
-        
-        db.add(otp)
-        db.commit()
-        db.refresh(otp)
-        
-        return otp
+        return self.store.issue(db, record, delivery_method)
     
-    @staticmethod
     def verify_otp(
+        self,
         db: Session,
         user_id: int = None,
         email: str = None,
         code: str = None,
         purpose: str = "password_reset"
     ) -> bool:
-        """Verify an OTP code for a user or email"""
-        if user_id is None and email is None:
+        """Verify an OTP code for a user or email, consuming it on success"""
+        if (user_id is None and email is None) or not code:
             return False
         
-        query = db.query(OTP).filter(
-            OTP.code == code,
-            OTP.purpose == purpose,
-            OTP.is_used == False
+        return self.store.consume(
+            db, code=code, purpose=purpose, user_id=user_id, email=email
         )
-        
-        if user_id:
-            query = query.filter(OTP.user_id == user_id)
-        elif email:
-            query = query.filter(OTP.email == email)
-        
-        otp = query.first()
-        
-        if not otp:
-            return False
-        
-        # Check if valid
-        if not otp.is_valid(code):
-            return False
-        
-        # Mark as used
-        otp.is_used = True
-        db.commit()
-        
-        return True
     
     @staticmethod
     def get_user_by_email(db: Session, email: str) -> User | None:
         """Get user by email"""
         return db.query(User).filter(User.email == email).first()
+    
+    def purge_expired(self, db: Session, batch_size: int = 1000) -> int:
+        """Remove used or expired OTPs from the store; returns how many"""
+        return self.store.purge(db, batch_size)
 
 
-otp_service = OTPService()
+otp_service = OTPService(get_otp_store())
+
+
+async def run_otp_sweeper() -> None:
+    """Periodically purge dead OTPs; started from the app lifespan"""
+    def sweep() -> int:
+        db = SessionLocal()
+        try:
+            return otp_service.purge_expired(db, settings.OTP_SWEEP_BATCH_SIZE)
+        finally:
+            db.close()
+    
+    while True:
+        await asyncio.sleep(settings.OTP_SWEEP_INTERVAL_SECONDS)
+        try:
+            deleted = await run_in_threadpool(sweep)
+            if deleted:
+                print(f"🧹 Purged {deleted} expired/used OTPs")
+        except Exception as e:
+            print(f"⚠️  OTP sweep failed: {e}")
@@ -0,0 +1,221 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.otp import OTP
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+@dataclass(frozen=True)
+class OTPRecord:
+    """An issued OTP as returned by every store"""
+    code: str
+    purpose: str
+    expires_at: datetime
+    user_id: Optional[int] = None
+    email: Optional[str] = None
+
+
+class OTPStore(ABC):
+    """
+    Where OTP codes live between issue and verify.
+
+    Issuing replaces any outstanding code for the same (purpose, user/email);
+    consuming succeeds at most once per code. ``db`` is only used by the SQL
+    store and may be ignored by others.
+    """
+
+    @abstractmethod
+    def issue(self, db: Session, record: OTPRecord, delivery_method: str) -> OTPRecord:
+        ...
+
+    @abstractmethod
+    def consume(
+        self,
+        db: Session,
+        *,
+        code: str,
+        purpose: str,
+        user_id: Optional[int] = None,
+        email: Optional[str] = None
+    ) -> bool:
+        ...
+
+    def purge(self, db: Session, batch_size: int) -> int:
+        """Drop dead codes; returns how many were removed"""
+        return 0
+
+
+class SQLOTPStore(OTPStore):
+    """OTPs in the otps table; survives restarts and works across workers"""
+
+    @staticmethod
+    def _subject(user_id: Optional[int], email: Optional[str]):
+        return OTP.user_id == user_id if user_id else OTP.email == email
+
+    def issue(self, db: Session, record: OTPRecord, delivery_method: str) -> OTPRecord:
+        # Invalidate any existing OTPs for this purpose
+        db.execute(
+            update(OTP)
+            .where(
+                OTP.purpose == record.purpose,
+                ~OTP.is_used,  # matches the partial indexes
+                self._subject(record.user_id, record.email),
+            )
+            .values(is_used=True)
+        )
+        db.execute(
+            insert(OTP).values(
+                user_id=record.user_id,
+                email=record.email,
+                code=record.code,
+                purpose=record.purpose,
+                delivery_method=delivery_method,
+                expires_at=record.expires_at,
+                is_used=False
+            )
+        )
+        db.commit()
+        return record
+
+    def consume(self, db, *, code, purpose, user_id=None, email=None) -> bool:
+        # Single conditional UPDATE: matches, marks used and checks expiry at once
+        result = db.execute(
+            update(OTP)
+            .where(
+                OTP.code == code,
+                OTP.purpose == purpose,
+                ~OTP.is_used,
+                OTP.expires_at > datetime.utcnow(),
+                self._subject(user_id, email),
+            )
+            .values(is_used=True)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount > 0
+
+    def purge(self, db: Session, batch_size: int) -> int:
+        """
+        Delete used or expired OTPs, committing every ``batch_size`` rows so
+        the sweep never holds long locks.
+        """
+        dead = or_(OTP.is_used == True, OTP.expires_at < datetime.utcnow())
+        deleted = 0
+        while True:
+            batch = select(OTP.id).where(dead).limit(batch_size).scalar_subquery()
+            count = db.execute(delete(OTP).where(OTP.id.in_(batch))).rowcount
+            db.commit()
+            deleted += count
+            if count < batch_size:
+                return deleted
+
+
+class LocalKeyValue:
+    """
+    In-process key-value store with per-key TTL.
+
+    Implements the same get/set/delete surface as RedisKeyValue, so it backs
+    the single-process "memory" OTP store and stands in for Redis in tests.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: Dict[str, Tuple[float, str]] = {}
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            return entry[1]
+
+    def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl_seconds, value)
+
+    def delete(self, key: str) -> bool:
+        """Remove a live key; True only for the caller that removed it"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return entry is not None and entry[0] > time.monotonic()
+
+    def purge(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            dead = [key for key, (expires, _) in self._data.items() if expires <= now]
+            for key in dead:
+                del self._data[key]
+        return len(dead)
+
+
+class RedisKeyValue:
+    """Shared key-value store for multi-worker deployments"""
+
+    def __init__(self, url: str):
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._client.get(key)
+
+    def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        self._client.set(key, value, ex=ttl_seconds)
+
+    def delete(self, key: str) -> bool:
+        return self._client.delete(key) == 1
+
+    def purge(self) -> int:
+        return 0  # Redis expires keys itself
+
+
+class KeyValueOTPStore(OTPStore):
+    """
+    OTPs as TTL'd keys, one per (purpose, user/email): issuing is a single
+    SET and verifying a GET plus DELETE, with no database round trips.
+    """
+
+    def __init__(self, kv):
+        self.kv = kv
+
+    @staticmethod
+    def _key(purpose: str, user_id: Optional[int], email: Optional[str]) -> str:
+        subject = f"user:{user_id}" if user_id else f"email:{email}"
+        return f"otp:{purpose}:{subject}"
+
+    def issue(self, db: Session, record: OTPRecord, delivery_method: str) -> OTPRecord:
+        ttl = max(1, int((record.expires_at - datetime.utcnow()).total_seconds()))
+        self.kv.set(self._key(record.purpose, record.user_id, record.email), record.code, ttl)
+        return record
+
+    def consume(self, db, *, code, purpose, user_id=None, email=None) -> bool:
+        key = self._key(purpose, user_id, email)
+        if self.kv.get(key) != code:
+            return False
+        # Only one concurrent verifier gets to delete the key
+        return self.kv.delete(key)
+
+    def purge(self, db: Session, batch_size: int) -> int:
+        return self.kv.purge()
+
+
+def get_otp_store() -> OTPStore:
+    """Build the store selected by OTP_STORE ("sql", "memory" or "redis")"""
+    if settings.OTP_STORE == "memory":
+        return KeyValueOTPStore(LocalKeyValue())
+    if settings.OTP_STORE == "redis":
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("OTP_STORE=redis requires the redis package")
+        return KeyValueOTPStore(RedisKeyValue(settings.OTP_REDIS_URL))
+    return SQLOTPStore()
@@ -0,0 +1,139 @@
+import threading
+import time
+from datetime import datetime, time as dt_time
+from typing import Dict, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.achievement import Achievement
+from app.models.goal import Goal
+from app.models.skill import Skill
+from app.models.user import User
+
+
+# Content tables whose totals appear on the dashboard, by __tablename__
+CONTENT_TOTALS = {
+    Achievement.__tablename__: "total_achievements",
+    Skill.__tablename__: "total_skills",
+    Goal.__tablename__: "total_goals",
+}
+
+
+class SystemStatsService:
+    """
+    Admin dashboard totals.
+
+    In "query" mode the overview is one aggregate statement (a single pass
+    over users with FILTER clauses plus one COUNT per content table), cached
+    for ``SYSTEM_STATS_TTL_SECONDS``. Concurrent callers on a cold cache
+    wait for the one computation in flight instead of each running it.
+
+    In "counters" mode that statement only seeds a snapshot, which writes
+    then adjust in place; it is recomputed every
+    ``SYSTEM_STATS_RECONCILE_SECONDS`` or after ``invalidate()``, which also
+    picks up writes made by other workers.
+    """
+    
+    def __init__(self, mode: str, ttl_seconds: float, reconcile_seconds: float):
+        self.mode = mode
+        self.ttl_seconds = ttl_seconds
+        self.reconcile_seconds = reconcile_seconds
+        self._lock = threading.Lock()
+        self._compute_lock = threading.Lock()
+        self._snapshot: Optional[Dict[str, int]] = None
+        self._computed_at = 0.0
+        self._day = None
+        self.computes = 0
+    
+    @staticmethod
+    def _stmt(today_start: datetime):
+        def total(model):
+            return select(func.count()).select_from(model).scalar_subquery()
+        
+        return select(
+            func.count(User.id).label("total_users"),
+            func.count(User.id).filter(User.is_active == True).label("active_users"),
+            func.count(User.id).filter(User.is_email_verified == True).label("verified_users"),
+            func.count(User.id).filter(User.subscription_tier == "pro").label("pro_users"),
+            # A range on the raw column, unlike date(created_at) = today
+            func.count(User.id).filter(User.created_at >= today_start).label("users_created_today"),
+            total(Achievement).label("total_achievements"),
+            total(Skill).label("total_skills"),
+            total(Goal).label("total_goals"),
+        )
+    
+    def compute(self, db: Session) -> Dict[str, int]:
+        """Run the aggregate statement, bypassing the cache"""
+        today = datetime.utcnow().date()
+        row = db.execute(self._stmt(datetime.combine(today, dt_time.min))).one()
+        with self._lock:
+            self._snapshot = {key: value or 0 for key, value in row._mapping.items()}
+            self._computed_at = time.monotonic()
+            self._day = today
+            self.computes += 1
+            return dict(self._snapshot)
+    
+    def _fresh(self) -> Optional[Dict[str, int]]:
+        max_age = self.reconcile_seconds if self.mode == "counters" else self.ttl_seconds
+        with self._lock:
+            if self._snapshot is None or self._computed_at + max_age <= time.monotonic():
+                return None
+            today = datetime.utcnow().date()
+            if today != self._day:
+                if self.mode != "counters":
+                    return None
+                # Counters carry over; only "today" starts again at zero
+                self._snapshot["users_created_today"] = 0
+                self._day = today
+            return dict(self._snapshot)
+    
+    def get(self, db: Session) -> Dict[str, int]:
+        """Cached overview; at most one caller recomputes at a time"""
+        stats = self._fresh()
+        if stats is not None:
+            return stats
+        with self._compute_lock:
+            # Whoever held the lock before us may have just filled the cache
+            stats = self._fresh()
+            if stats is not None:
+                return stats
+            return self.compute(db)
+    
+    def adjust(self, **deltas: int) -> None:
+        """Apply committed changes to the counter snapshot (counters mode only)"""
+        if self.mode != "counters":
+            return
+        with self._lock:
+            if self._snapshot is None:
+                return
+            for key, delta in deltas.items():
+                self._snapshot[key] = max(0, self._snapshot[key] + delta)
+    
+    def record_content(self, model, delta: int) -> None:
+        """A committed create (+n) or delete (-n) of achievements, skills or goals"""
+        key = CONTENT_TOTALS.get(model.__tablename__)
+        if key:
+            self.adjust(**{key: delta})
+    
+    def record_user_created(self, user: User) -> None:
+        self.adjust(
+            total_users=1,
+            active_users=int(bool(user.is_active)),
+            verified_users=int(bool(user.is_email_verified)),
+            pro_users=int(user.subscription_tier == "pro"),
+            users_created_today=1,
+        )
+    
+    def invalidate(self) -> None:
+        """Recompute on the next read, e.g. after a change that is hard to count"""
+        with self._lock:
+            self._snapshot = None
+
+
+system_stats = SystemStatsService(
+    mode=settings.SYSTEM_STATS_MODE,
+    ttl_seconds=settings.SYSTEM_STATS_TTL_SECONDS,
+    reconcile_seconds=settings.SYSTEM_STATS_RECONCILE_SECONDS,
+)
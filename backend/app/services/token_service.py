@@ -0,0 +1,124 @@
+from datetime import datetime
+from typing import Any, Optional
+from jose import jwt, JWTError
+from pydantic import ValidationError
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.revocation import RevocationSet
+from app.core.security import create_access_token, create_refresh_token, user_token_claims
+from app.core.user_cache import user_cache
+from app.crud.crud_user import user as crud_user
+from app.models.revoked_token import RevokedToken
+from app.schemas.token import TokenPayload
+
+
+revoked_refresh_tokens = RevocationSet(
+    capacity=settings.REVOCATION_FILTER_CAPACITY,
+    error_rate=settings.REVOCATION_FILTER_ERROR_RATE,
+)
+
+
+class TokenService:
+    """Service for issuing token pairs and rotating refresh tokens"""
+    
+    @staticmethod
+    def issue_tokens(user: Any) -> dict:
+        """Issue an access/refresh token pair for a User or UserPrincipal"""
+        return {
+            "access_token": create_access_token(
+                subject=user.id, claims=user_token_claims(user)
+            ),
+            "refresh_token": create_refresh_token(user.id, user.token_version),
+            "token_type": "bearer",
+        }
+    
+    @staticmethod
+    def decode_refresh_token(token: str) -> Optional[TokenPayload]:
+        """Verify a refresh token; None if invalid, expired or not a refresh token"""
+        try:
+            payload = TokenPayload(**jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            ))
+        except (JWTError, ValidationError):
+            return None
+        if payload.typ != "refresh" or not payload.sub or not payload.jti or not payload.exp:
+            return None
+        return payload
+    
+    @staticmethod
+    def load_revocations(db: Session) -> None:
+        """Purge expired revocations and rebuild the in-memory filter"""
+        db.execute(delete(RevokedToken).where(RevokedToken.expires_at < datetime.utcnow()))
+        db.commit()
+        revoked_refresh_tokens.reset(db.scalars(select(RevokedToken.jti)))
+    
+    @staticmethod
+    async def _arevoke(db: AsyncSession, payload: TokenPayload) -> bool:
+        """Record a refresh token as used; False if it already was"""
+        try:
+            await db.execute(insert(RevokedToken).values(
+                jti=payload.jti,
+                user_id=payload.sub,
+                expires_at=datetime.utcfromtimestamp(payload.exp),
+            ))
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            return False
+        finally:
+            revoked_refresh_tokens.add(payload.jti)
+        return True
+    
+    @staticmethod
+    async def _ais_revoked(db: AsyncSession, jti: str) -> bool:
+        # Only consulted when the filter reports a (possibly false) hit
+        if not revoked_refresh_tokens.might_contain(jti):
+            return False
+        return await db.scalar(
+            select(RevokedToken.id).where(RevokedToken.jti == jti)
+        ) is not None
+    
+    @staticmethod
+    async def arotate(db: AsyncSession, refresh_token: str) -> Optional[dict]:
+        """
+        Exchange a refresh token for a new pair, revoking the old one.
+        
+        Presenting an already-rotated token means it leaked, so every token
+        issued to the user is revoked. Returns None when refused.
+        """
+        payload = TokenService.decode_refresh_token(refresh_token)
+        if payload is None:
+            return None
+        
+        if await TokenService._ais_revoked(db, payload.jti):
+            await crud_user.arevoke_tokens(db, id=payload.sub)
+            return None
+        
+        principal = user_cache.get(payload.sub)
+        if principal is None:
+            principal = await crud_user.aget_principal(db, id=payload.sub)
+            if principal is None:
+                return None
+            user_cache.set(principal)
+        if not principal.is_active or payload.ver != principal.token_version:
+            return None
+        
+        # Another worker may have rotated it already; the unique jti decides
+        if not await TokenService._arevoke(db, payload):
+            await crud_user.arevoke_tokens(db, id=payload.sub)
+            return None
+        
+        return TokenService.issue_tokens(principal)
+    
+    @staticmethod
+    async def arevoke(db: AsyncSession, refresh_token: str) -> None:
+        """Revoke a refresh token (logout); invalid tokens are ignored"""
+        payload = TokenService.decode_refresh_token(refresh_token)
+        if payload is not None:
+            await TokenService._arevoke(db, payload)
+
+
+token_service = TokenService()
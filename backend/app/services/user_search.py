@@ -0,0 +1,248 @@
+import asyncio
+import heapq
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import case, func, or_, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.models.user import User
+
+
+def _like_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _rank(query: str, email: str, name: str) -> Optional[int]:
+    """0 exact, 1 prefix, 2 word prefix, 3 substring; None if no match"""
+    if query == email or query == name:
+        return 0
+    if email.startswith(query) or name.startswith(query):
+        return 1
+    if any(word.startswith(query) for word in name.split()):
+        return 2
+    if query in email or query in name:
+        return 3
+    return None
+
+
+class TrigramUserSearch:
+    """
+    PostgreSQL search over users.email and users.full_name.
+
+    The pg_trgm GIN indexes (see migration f4c8a2e6b951) serve ILIKE
+    '%term%' and 'term%' without scanning users; results are ranked by
+    match type, then trigram similarity.
+    """
+    
+    def _match_rank(self, term: str):
+        pattern = _like_escape(term)
+        name = func.coalesce(User.full_name, "")
+        return case(
+            (or_(func.lower(User.email) == term, func.lower(name) == term), 0),
+            (or_(User.email.ilike(f"{pattern}%", escape="\\"), name.ilike(f"{pattern}%", escape="\\")), 1),
+            (name.ilike(f"% {pattern}%", escape="\\"), 2),
+            else_=3,
+        )
+    
+    def search(self, db: Session, query: str, *, skip: int = 0, limit: int = 100) -> List[int]:
+        """Ids of users whose email or name contains ``query``, best first"""
+        term = query.strip().lower()
+        pattern = f"%{_like_escape(term)}%"
+        name = func.coalesce(User.full_name, "")
+        stmt = (
+            select(User.id)
+            .where(or_(User.email.ilike(pattern, escape="\\"), User.full_name.ilike(pattern, escape="\\")))
+            .order_by(
+                self._match_rank(term),
+                func.greatest(func.similarity(User.email, term), func.similarity(name, term)).desc(),
+                User.id,
+            )
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(db.scalars(stmt).all())
+    
+    def autocomplete(self, db: Session, prefix: str, *, limit: int = 10) -> List[int]:
+        """Ids of users whose email, name or a word of their name starts with ``prefix``"""
+        term = prefix.strip().lower()
+        pattern = _like_escape(term)
+        stmt = (
+            select(User.id)
+            .where(or_(
+                User.email.ilike(f"{pattern}%", escape="\\"),
+                User.full_name.ilike(f"{pattern}%", escape="\\"),
+                User.full_name.ilike(f"% {pattern}%", escape="\\"),
+            ))
+            .order_by(self._match_rank(term), func.length(User.email), User.id)
+            .limit(limit)
+        )
+        return list(db.scalars(stmt).all())
+    
+    # The database indexes maintain themselves
+    
+    def rebuild(self, db: Session) -> None:
+        pass
+    
+    def add(self, user_id: int, email: str, full_name: Optional[str]) -> None:
+        pass
+    
+    def remove(self, user_id: int) -> None:
+        pass
+
+
+class NgramUserSearch:
+    """
+    In-process trigram index over users.email and users.full_name for
+    backends without pg_trgm (SQLite).
+
+    A query looks up the posting sets of its n-grams, intersects them
+    smallest first and only then checks the few surviving candidates, so
+    lookups do not scan users. Writes made through crud_user update the
+    index in place. The full load from the database happens off the
+    request path: at startup and then every ``USER_SEARCH_REBUILD_SECONDS``
+    in ``run_user_search_rebuilder``, to pick up other workers' writes.
+    Requests only read the current index.
+    """
+    
+    # Bigrams too, so two-character queries also avoid a full scan
+    GRAM_SIZES = (2, 3)
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._docs: Dict[int, Tuple[str, str]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._built = False
+    
+    @classmethod
+    def _grams(cls, text: str) -> Set[str]:
+        return {
+            text[i:i + n] for n in cls.GRAM_SIZES for i in range(len(text) - n + 1)
+        }
+    
+    @classmethod
+    def _query_grams(cls, term: str) -> Set[str]:
+        n = min(len(term), cls.GRAM_SIZES[-1])
+        if n < cls.GRAM_SIZES[0]:
+            return set()
+        return {term[i:i + n] for i in range(len(term) - n + 1)}
+    
+    @classmethod
+    def _index(cls, docs, postings, user_id: int, email: str, full_name: Optional[str]) -> None:
+        doc = (email.lower(), (full_name or "").lower())
+        docs[user_id] = doc
+        for gram in cls._grams(doc[0]) | cls._grams(doc[1]):
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = {user_id}
+            else:
+                posting.add(user_id)
+    
+    def _unindex(self, user_id: int) -> None:
+        doc = self._docs.pop(user_id, None)
+        if doc is None:
+            return
+        for gram in self._grams(doc[0]) | self._grams(doc[1]):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(user_id)
+                if not posting:
+                    del self._postings[gram]
+    
+    def rebuild(self, db: Session) -> None:
+        """Load every user into a new index and swap it in"""
+        docs: Dict[int, Tuple[str, str]] = {}
+        postings: Dict[str, Set[int]] = {}
+        for row in db.execute(select(User.id, User.email, User.full_name)):
+            self._index(docs, postings, row.id, row.email, row.full_name)
+        with self._lock:
+            self._docs = docs
+            self._postings = postings
+            self._built = True
+    
+    def _ensure_built(self, db: Session) -> None:
+        # The lifespan builds the index before serving; this only covers
+        # use without it (scripts, a lifespan-less test client)
+        if self._built:
+            return
+        with self._build_lock:
+            if not self._built:
+                self.rebuild(db)
+    
+    def _candidates(self, term: str) -> Set[int]:
+        grams = self._query_grams(term)
+        if not grams:
+            # A single character: fall back to checking every user
+            return set(self._docs)
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+            if not result:
+                break
+        return result
+    
+    def _ranked(self, term: str, max_rank: int, count: int) -> List[int]:
+        """The ``count`` best matches; only they are sorted"""
+        ranked = []
+        with self._lock:
+            for user_id in self._candidates(term):
+                email, name = self._docs[user_id]
+                rank = _rank(term, email, name)
+                if rank is not None and rank <= max_rank:
+                    ranked.append((rank, len(email), user_id))
+        return [user_id for _, _, user_id in heapq.nsmallest(count, ranked)]
+    
+    def search(self, db: Session, query: str, *, skip: int = 0, limit: int = 100) -> List[int]:
+        """Ids of users whose email or name contains ``query``, best first"""
+        self._ensure_built(db)
+        return self._ranked(query.strip().lower(), 3, skip + limit)[skip:]
+    
+    def autocomplete(self, db: Session, prefix: str, *, limit: int = 10) -> List[int]:
+        """Ids of users whose email, name or a word of their name starts with ``prefix``"""
+        self._ensure_built(db)
+        return self._ranked(prefix.strip().lower(), 2, limit)
+    
+    def add(self, user_id: int, email: str, full_name: Optional[str]) -> None:
+        """Index a created or renamed user"""
+        with self._lock:
+            if not self._built:
+                return  # Not built yet; the first build loads everyone
+            self._unindex(user_id)
+            self._index(self._docs, self._postings, user_id, email, full_name)
+    
+    def remove(self, user_id: int) -> None:
+        with self._lock:
+            self._unindex(user_id)
+
+
+def get_user_search():
+    """pg_trgm-backed search on PostgreSQL, the in-process n-gram index elsewhere"""
+    if settings.DATABASE_URL.startswith("postgres"):
+        return TrigramUserSearch()
+    return NgramUserSearch()
+
+
+user_search = get_user_search()
+
+
+def _rebuild_user_search() -> None:
+    db = SessionLocal()
+    try:
+        user_search.rebuild(db)
+    finally:
+        db.close()
+
+
+async def run_user_search_rebuilder() -> None:
+    """Periodically reload the search index; started from the app lifespan"""
+    while True:
+        await asyncio.sleep(settings.USER_SEARCH_REBUILD_SECONDS)
+        try:
+            await run_in_threadpool(_rebuild_user_search)
+        except Exception as e:
+            print(f"⚠️  User search rebuild failed: {e}")
@@ -0,0 +1,118 @@
+"""
+Measure email rendering throughput: the inline f-string builder that
+EmailService used before the template registry, the compiled template
+rendered one message at a time, and render_batch for bulk sends.
+
+Every variant builds the same list of personalised EmailMessage objects
+per round, so allocation and cache effects are comparable.
+
+Usage: python benchmark_email.py [rounds]
+"""
+import os
+import sys
+import time
+from typing import Optional
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+
+from app.services.email_templates import email_templates
+from app.services.email_transport import EmailMessage
+
+
+def legacy_otp_email(to_email: str, otp_code: str, user_name: Optional[str] = None) -> EmailMessage:
+    """EmailService.otp_email as it was before the template registry"""
+    subject = "Your OTP Code - Password Reset"
+    
+    html_content = f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <style>
+                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+                .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
+                .content {{ background: #f9fafb; padding: 30px; border-radius: 0 0 10px 10px; }}
+                .otp-box {{ background: white; border: 2px dashed #667eea; border-radius: 8px; padding: 20px; text-align: center; margin: 20px 0; }}
+                .otp-code {{ font-size: 32px; font-weight: bold; color: #667eea; letter-spacing: 8px; }}
+                .footer {{ text-align: center; margin-top: 20px; color: #666; font-size: 12px; }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="header">
+                    <h1>🔐 Password Reset</h1>
+                </div>
+                <div class="content">
+                    <p>Hello{f" {user_name}" if user_name else ""},</p>
+                    <p>You requested to reset your password for your Achievement Web account.</p>
+                    <p>Here is your OTP code:</p>
+
+                    <div class="otp-box">
+                        <div class="otp-code">{otp_code}</div>
+                    </div>
+
+                    <p><strong>This code will expire in 10 minutes.</strong></p>
+                    <p>If you did not request a password reset, please ignore this email.</p>
+
+                    <div class="footer">
+                        <p>© 2026 Achievement Web. All rights reserved.</p>
+                    </div>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+    
+    return EmailMessage(
+        to_email=to_email,
+        subject=subject,
+        html_content=html_content,
+        template_data={'otp_code': otp_code},
+    )
+
+
+def bench(label, fn, rounds, per_round):
+    fn()  # warm up
+    best = float("inf")
+    for _ in range(10):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    per_render = best / (rounds * per_round)
+    print(f"{label:<28} {per_render * 1e6:8.2f} us/render {1 / per_render:10.0f} renders/s")
+    return per_render
+
+
+rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+batch_size = 100
+recipients = [
+    {"to_email": f"user{i}@example.com", "user_name": f"User {i}", "otp_code": f"{i:06d}"}
+    for i in range(batch_size)
+]
+
+
+def legacy():
+    return [legacy_otp_email(r["to_email"], r["otp_code"], r["user_name"]) for r in recipients]
+
+
+def compiled():
+    return [
+        email_templates.render("password_reset_otp", r["to_email"], r["user_name"], otp_code=r["otp_code"])
+        for r in recipients
+    ]
+
+
+
+def batch():
+    return email_templates.render_batch("password_reset_otp", recipients)
+
+
+print(f"Email render, {rounds} rounds of {batch_size} recipients (best of 10)")
+baseline = bench("inline f-string (before)", legacy, rounds, batch_size)
+single = bench("compiled, one at a time", compiled, rounds, batch_size)
+batched = bench("compiled, render_batch", batch, rounds, batch_size)
+print(f"One at a time vs before: {baseline / single:.2f}x")
+print(f"render_batch vs before:  {baseline / batched:.2f}x")
@@ -0,0 +1,47 @@
+import os
+import tempfile
+
+# Settings are read at import time, so configure them before importing app
+_db_dir = tempfile.mkdtemp(prefix="achievement-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ["ENVIRONMENT"] = "test"
+os.environ["SECRET_KEY"] = "test-secret-key"
+os.environ["EMAIL_TRANSPORT"] = "sink"
+os.environ["EMAIL_WORKERS"] = "0"
+os.environ["OTP_SWEEP_INTERVAL_SECONDS"] = "0"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["FREE_REQUESTS_PER_MINUTE"] = "0"
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.base import Base, engine
+import app.models  # noqa: F401  (registers every table)
+
+
+@pytest.fixture
+def db_tables():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def client(db_tables):
+    from app.main import app
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def auth_headers(client):
+    client.post(
+        "/api/auth/register",
+        json={"email": "user@example.com", "password": "Passw0rd!", "full_name": "Test User"},
+    )
+    response = client.post(
+        "/api/auth/login", data={"username": "user@example.com", "password": "Passw0rd!"}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
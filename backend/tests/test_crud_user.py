@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, select, update
+
+from app.core.user_cache import UserPrincipal, user_cache
+from app.crud.crud_user import user as crud_user
+from app.db.base import AsyncSessionLocal, SessionLocal
+from app.models.daily_user_stats import DailyUserStats
+from app.models.user import User
+from app.schemas.user import UserCreate
+from app.services.growth_stats import GrowthStatsService
+
+
+@pytest.fixture
+def rolled_up_user(db_tables):
+    """A user who signed up yesterday, already counted in daily_user_stats"""
+    yesterday = datetime.utcnow() - timedelta(days=1)
+    with SessionLocal() as db:
+        db_obj = crud_user.create(
+            db, obj_in=UserCreate(email="old@example.com", password="Passw0rd!")
+        )
+        db.execute(update(User).where(User.id == db_obj.id).values(created_at=yesterday))
+        db.commit()
+        GrowthStatsService().refresh(db)
+        assert _new_users(db, yesterday) == 1
+        return db_obj.id, yesterday
+
+
+def _new_users(db, day):
+    return db.scalar(select(DailyUserStats.new_users).where(DailyUserStats.day == day.date()))
+
+
+def test_remove_deletes_and_decrements_in_one_commit(rolled_up_user):
+    user_id, signed_up = rolled_up_user
+    commits = []
+    with SessionLocal() as db:
+        event.listen(db, "after_commit", lambda session: commits.append(session))
+        crud_user.remove(db, id=user_id)
+
+        assert len(commits) == 1
+        assert db.get(User, user_id) is None
+        assert _new_users(db, signed_up) == 0
+
+
+async def test_aremove_deletes_and_decrements_in_one_commit(rolled_up_user):
+    user_id, signed_up = rolled_up_user
+    commits = []
+    async with AsyncSessionLocal() as db:
+        event.listen(db.sync_session, "after_commit", lambda session: commits.append(session))
+        await crud_user.aremove(db, id=user_id)
+
+        assert len(commits) == 1
+    with SessionLocal() as db:
+        assert db.get(User, user_id) is None
+        assert _new_users(db, signed_up) == 0
+
+
+def test_provision_oauth_drops_cached_principal(rolled_up_user):
+    user_id, _ = rolled_up_user
+    with SessionLocal() as db:
+        user_cache.set(UserPrincipal.from_user(db.get(User, user_id)))
+        db_obj = crud_user.provision_oauth(db, email="old@example.com", full_name="Old User")
+
+        assert db_obj.id == user_id
+        assert user_cache.get(user_id) is None
+
+
+async def test_aprovision_oauth_drops_cached_principal(rolled_up_user):
+    user_id, _ = rolled_up_user
+    with SessionLocal() as db:
+        user_cache.set(UserPrincipal.from_user(db.get(User, user_id)))
+    async with AsyncSessionLocal() as db:
+        db_obj = await crud_user.aprovision_oauth(db, email="old@example.com")
+
+        assert db_obj.id == user_id
+        assert user_cache.get(user_id) is None
@@ -0,0 +1,116 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.models.email_outbox import EmailDeadLetter, EmailOutbox
+from app.services.email_queue import EmailQueue
+from app.services.email_templates import email_templates
+from app.services.email_transport import EmailSendError, EmailTransport, SinkTransport
+
+
+class FailingTransport(EmailTransport):
+    def send(self, message):
+        raise EmailSendError("SendGrid returned 503")
+
+
+@pytest.fixture
+def db(db_tables):
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+def otp_message(n):
+    return email_templates.render(
+        "password_reset_otp", f"user{n}@example.com", "User", otp_code=f"{n:06d}"
+    )
+
+
+def test_sink_receives_queued_messages(db):
+    queue = EmailQueue(SinkTransport())
+    queue.enqueue_many([otp_message(n) for n in range(3)])
+    
+    assert queue.process_batch(10) == 3
+    assert [m.to_email for m in queue.transport.sent] == [
+        "user0@example.com", "user1@example.com", "user2@example.com"
+    ]
+    assert queue.transport.sent[0].template_data == {"otp_code": "000000"}
+    assert db.scalars(select(EmailOutbox)).all() == []
+
+
+def test_leased_messages_are_not_claimed_twice(db):
+    queue = EmailQueue(SinkTransport())
+    queue.enqueue_many([otp_message(n) for n in range(5)])
+    
+    first = queue.claim_batch(db, 3)
+    second = queue.claim_batch(db, 10)
+    assert len(first) == 3
+    assert {row.id for row in first}.isdisjoint(row.id for row in second)
+    assert queue.claim_batch(db, 10) == []
+
+
+def test_expired_lease_is_reclaimed(db):
+    queue = EmailQueue(SinkTransport())
+    queue.enqueue(otp_message(1))
+    assert len(queue.claim_batch(db, 10)) == 1
+    
+    db.execute(update(EmailOutbox).values(locked_until=datetime.utcnow() - timedelta(seconds=1)))
+    db.commit()
+    assert len(queue.claim_batch(db, 10)) == 1
+
+
+def test_concurrent_workers_never_share_a_message(db):
+    queue = EmailQueue(SinkTransport())
+    queue.enqueue_many([otp_message(n) for n in range(40)])
+    claimed = []
+    lock = threading.Lock()
+    
+    def worker():
+        session = SessionLocal()
+        try:
+            while True:
+                rows = queue.claim_batch(session, 3)
+                if not rows:
+                    return
+                with lock:
+                    claimed.extend(row.id for row in rows)
+        finally:
+            session.close()
+    
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(claimed) == sorted(set(claimed))
+    assert len(claimed) == 40
+
+
+def test_failures_back_off_then_dead_letter(db, monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_MAX_ATTEMPTS", 3)
+    monkeypatch.setattr(settings, "EMAIL_RETRY_BASE_SECONDS", 60.0)
+    queue = EmailQueue(FailingTransport())
+    queue.enqueue(otp_message(7))
+    
+    queue.process_batch(10)
+    row = db.scalar(select(EmailOutbox))
+    assert row.attempts == 1
+    assert row.locked_until is None
+    assert row.next_attempt_at > datetime.utcnow() + timedelta(seconds=50)
+    # Not due yet, so nothing is claimed
+    assert queue.process_batch(10) == 0
+    
+    for _ in range(2):
+        db.execute(update(EmailOutbox).values(next_attempt_at=datetime.utcnow()))
+        db.commit()
+        queue.process_batch(10)
+    
+    assert db.scalars(select(EmailOutbox)).all() == []
+    dead = db.scalar(select(EmailDeadLetter))
+    assert dead.to_email == "user7@example.com"
+    assert dead.attempts == 3
+    assert "503" in dead.last_error
@@ -0,0 +1,56 @@
+import html
+
+import pytest
+
+from app.services.email_templates import (
+    PASSWORD_RESET_OTP_HTML,
+    EmailTemplate,
+    email_templates,
+)
+
+
+def test_render_substitutes_fields_and_escapes_values():
+    message = email_templates.render(
+        "password_reset_otp", "a@example.com", "<Bob & Co>", otp_code="123456"
+    )
+
+    assert "Hello &lt;Bob &amp; Co&gt;," in message.html_content
+    assert '<div class="otp-code">123456</div>' in message.html_content
+    assert message.subject == "Your OTP Code - Password Reset"
+    assert message.template_data == {"otp_code": "123456"}
+
+
+def test_markup_is_kept_ascii_with_the_same_meaning():
+    content = email_templates.render(
+        "password_reset_otp", "a@example.com", "Ann", otp_code="1"
+    ).html_content
+
+    assert content.isascii()
+    expected = PASSWORD_RESET_OTP_HTML.replace("{{greeting}}", " Ann").replace("{{otp_code}}", "1")
+    assert html.unescape(content) == html.unescape(expected)
+
+
+def test_render_batch_matches_render():
+    recipients = [
+        {"to_email": "a@example.com", "user_name": "Ann", "otp_code": "000001"},
+        {"to_email": "b@example.com", "otp_code": "000002"},
+    ]
+
+    assert email_templates.render_batch("registration_otp", recipients) == [
+        email_templates.render("registration_otp", **recipient) for recipient in recipients
+    ]
+    # The caller's dicts are left alone
+    assert recipients[0]["user_name"] == "Ann"
+
+
+def test_missing_fields_render_empty():
+    template = EmailTemplate("t", "Subject", "<p>{{ a }}-{{b}}</p>")
+
+    assert template.fields == ("a", "b")
+    assert template.render(a="x") == "<p>x-</p>"
+
+
+@pytest.mark.parametrize("field", ["class", "_escape", "1st"])
+def test_invalid_field_names_are_rejected(field):
+    with pytest.raises(ValueError):
+        EmailTemplate("t", "Subject", "{{%s}}" % field)
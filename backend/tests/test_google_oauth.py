@@ -0,0 +1,143 @@
+import time
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import JWTError, jwk, jwt
+
+from app.core.config import settings
+from app.core.http_client import set_http_client
+from app.services.google_oauth import GoogleOAuthService
+
+CLIENT_ID = "test-client.apps.googleusercontent.com"
+ISSUER = "https://accounts.google.com"
+
+
+def _private_pem():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+class StubGoogle:
+    """Token endpoint and JWKS served from an httpx.MockTransport"""
+
+    def __init__(self):
+        self.signing_keys = {"key-1": _private_pem()}
+        self.published = ["key-1"]
+        self.jwks_fetches = 0
+        self.id_token = None
+
+    def public_jwks(self):
+        keys = []
+        for kid in self.published:
+            public = jwk.construct(self.signing_keys[kid], "RS256").public_key().to_dict()
+            keys.append(dict(public, kid=kid, use="sig"))
+        return {"keys": keys}
+
+    def sign(self, kid="key-1", access_token=None, **overrides):
+        now = int(time.time())
+        claims = {
+            "iss": ISSUER,
+            "aud": CLIENT_ID,
+            "sub": "google-user-1",
+            "email": "user@example.com",
+            "iat": now,
+            "exp": now + 600,
+        }
+        claims.update(overrides)
+        return jwt.encode(
+            claims,
+            self.signing_keys[kid],
+            algorithm="RS256",
+            headers={"kid": kid},
+            access_token=access_token,
+        )
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url == settings.GOOGLE_JWKS_URL:
+            self.jwks_fetches += 1
+            return httpx.Response(
+                200, json=self.public_jwks(), headers={"cache-control": "public, max-age=3600"}
+            )
+        if request.url == settings.GOOGLE_TOKEN_URL:
+            return httpx.Response(
+                200, json={"access_token": "access-1", "id_token": self.id_token}
+            )
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def google(monkeypatch):
+    monkeypatch.setattr(settings, "GOOGLE_CLIENT_ID", CLIENT_ID)
+    stub = StubGoogle()
+    set_http_client(httpx.AsyncClient(transport=httpx.MockTransport(stub.handler)))
+    yield stub
+    set_http_client(None)
+
+
+async def test_valid_id_token_is_accepted(google):
+    google.id_token = google.sign(access_token="access-1")
+    service = GoogleOAuthService()
+
+    tokens = await service.exchange_code("auth-code")
+    claims = await service.verify_id_token(tokens["id_token"], tokens["access_token"])
+
+    assert claims["sub"] == "google-user-1"
+    assert claims["email"] == "user@example.com"
+    assert google.jwks_fetches == 1
+
+
+async def test_keys_are_cached_between_logins(google):
+    service = GoogleOAuthService()
+
+    await service.verify_id_token(google.sign())
+    await service.verify_id_token(google.sign())
+
+    assert google.jwks_fetches == 1
+
+
+@pytest.mark.parametrize("claim, value", [
+    ("aud", "someone-else.apps.googleusercontent.com"),
+    ("iss", "https://evil.example.com"),
+])
+async def test_wrong_audience_or_issuer_is_rejected(google, claim, value):
+    service = GoogleOAuthService()
+
+    with pytest.raises(JWTError):
+        await service.verify_id_token(google.sign(**{claim: value}))
+
+
+async def test_unknown_kid_refreshes_jwks_once(google):
+    service = GoogleOAuthService()
+    await service.verify_id_token(google.sign())
+    assert google.jwks_fetches == 1
+
+    # Google rotates in a new key
+    google.signing_keys["key-2"] = _private_pem()
+    google.published.append("key-2")
+    claims = await service.verify_id_token(google.sign(kid="key-2"))
+
+    assert claims["sub"] == "google-user-1"
+    assert google.jwks_fetches == 2
+
+
+async def test_kid_missing_after_refresh_is_rejected(google):
+    service = GoogleOAuthService()
+    google.signing_keys["rogue"] = _private_pem()
+
+    with pytest.raises(JWTError):
+        await service.verify_id_token(google.sign(kid="rogue"))
+    assert google.jwks_fetches == 1
+
+
+async def test_wrong_at_hash_is_rejected(google):
+    service = GoogleOAuthService()
+    id_token = google.sign(access_token="access-1")
+
+    with pytest.raises(JWTError):
+        await service.verify_id_token(id_token, access_token="another-access-token")
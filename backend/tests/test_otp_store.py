@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services import otp_store
+from app.services.otp_store import KeyValueOTPStore, LocalKeyValue, OTPRecord, OTPStore
+
+
+@pytest.fixture
+def store():
+    return KeyValueOTPStore(LocalKeyValue())
+
+
+def _record(code="123456", user_id=1, minutes=10):
+    return OTPRecord(
+        code=code,
+        purpose="password_reset",
+        expires_at=datetime.utcnow() + timedelta(minutes=minutes),
+        user_id=user_id,
+    )
+
+
+def test_otp_store_is_abstract():
+    with pytest.raises(TypeError):
+        OTPStore()
+
+
+def test_issue_then_consume_once(store):
+    store.issue(None, _record(), "email")
+
+    assert store.consume(None, code="123456", purpose="password_reset", user_id=1)
+    assert not store.consume(None, code="123456", purpose="password_reset", user_id=1)
+
+
+def test_wrong_code_or_subject_is_rejected(store):
+    store.issue(None, _record(), "email")
+
+    assert not store.consume(None, code="654321", purpose="password_reset", user_id=1)
+    assert not store.consume(None, code="123456", purpose="password_reset", user_id=2)
+    assert not store.consume(None, code="123456", purpose="registration", user_id=1)
+    assert store.consume(None, code="123456", purpose="password_reset", user_id=1)
+
+
+def test_reissue_replaces_outstanding_code(store):
+    store.issue(None, _record(code="111111"), "email")
+    store.issue(None, _record(code="222222"), "email")
+
+    assert not store.consume(None, code="111111", purpose="password_reset", user_id=1)
+    assert store.consume(None, code="222222", purpose="password_reset", user_id=1)
+
+
+def test_expired_code_is_rejected(store, monkeypatch):
+    store.issue(None, _record(minutes=1), "email")
+    clock = otp_store.time.monotonic() + 61
+    monkeypatch.setattr(otp_store.time, "monotonic", lambda: clock)
+
+    assert not store.consume(None, code="123456", purpose="password_reset", user_id=1)
+    assert store.purge(None, batch_size=100) == 1
@@ -0,0 +1,74 @@
+import re
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.db.base import async_engine
+
+WRITE = re.compile(r"^\s*(INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+
+@contextmanager
+def count_writes():
+    """Collect the INSERT/UPDATE/DELETE statements the async engine runs"""
+    writes = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if WRITE.match(statement):
+            writes.append(statement)
+    
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield writes
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_create_achievement_runs_one_write(client, auth_headers):
+    with count_writes() as writes:
+        response = client.post("/api/achievements/", json={"title": "First"}, headers=auth_headers)
+    assert response.status_code in (200, 201)
+    assert len(writes) == 1
+
+
+def test_update_achievement_runs_one_write(client, auth_headers):
+    created = client.post("/api/achievements/", json={"title": "First"}, headers=auth_headers).json()
+    with count_writes() as writes:
+        response = client.put(
+            f"/api/achievements/{created['id']}", json={"title": "Second"}, headers=auth_headers
+        )
+    assert response.status_code == 200
+    assert response.json()["title"] == "Second"
+    assert len(writes) == 1
+
+
+def test_unchanged_update_does_not_touch_row(client, auth_headers):
+    created = client.post("/api/achievements/", json={"title": "First"}, headers=auth_headers).json()
+    first = client.put(
+        f"/api/achievements/{created['id']}", json={"title": "Second"}, headers=auth_headers
+    ).json()
+    with count_writes() as writes:
+        second = client.put(
+            f"/api/achievements/{created['id']}", json={"title": "Second"}, headers=auth_headers
+        ).json()
+    assert second["updated_at"] == first["updated_at"]
+    # Exactly the guarded UPDATE, which matches no row when nothing differs
+    assert len(writes) == 1
+    assert re.search(r"WHERE .* IS (NOT|DISTINCT FROM) ", writes[0], re.DOTALL)
+
+
+def test_update_not_owned_is_forbidden(client, auth_headers):
+    created = client.post("/api/achievements/", json={"title": "Mine"}, headers=auth_headers).json()
+    client.post(
+        "/api/auth/register",
+        json={"email": "other@example.com", "password": "Passw0rd!", "full_name": "Other"},
+    )
+    token = client.post(
+        "/api/auth/login", data={"username": "other@example.com", "password": "Passw0rd!"}
+    ).json()["access_token"]
+    response = client.put(
+        f"/api/achievements/{created['id']}",
+        json={"title": "Theirs"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 403
@@ -0,0 +1,53 @@
+import pytest
+
+from app.crud.crud_user import user as crud_user
+from app.db.base import SessionLocal
+from app.schemas.user import UserCreate
+from app.services.user_search import NgramUserSearch
+
+
+@pytest.fixture
+def admin_headers(client):
+    with SessionLocal() as db:
+        for email, name in [("ada@example.com", "Ada Lovelace"), ("alan@example.com", "Alan Turing")]:
+            crud_user.create(db, obj_in=UserCreate(email=email, password="Passw0rd!", full_name=name))
+        admin = crud_user.create(
+            db, obj_in=UserCreate(email="admin@example.com", password="Passw0rd!")
+        )
+        crud_user.update(db, db_obj=admin, obj_in={"is_superuser": True})
+    response = client.post(
+        "/api/auth/login", data={"username": "admin@example.com", "password": "Passw0rd!"}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_search_ranks_matches(client, admin_headers):
+    response = client.get("/api/admin/users", params={"search": "turing"}, headers=admin_headers)
+
+    assert response.status_code == 200
+    assert [row["email"] for row in response.json()] == ["alan@example.com"]
+
+
+@pytest.mark.parametrize("path, param", [
+    ("/api/admin/users", "search"),
+    ("/api/admin/users/autocomplete", "q"),
+])
+@pytest.mark.parametrize("term", ["", "   "])
+def test_blank_search_term_is_rejected(client, admin_headers, path, param, term):
+    response = client.get(path, params={param: term}, headers=admin_headers)
+
+    assert response.status_code == 422
+
+
+def test_requests_do_not_rebuild_a_built_index(db_tables, monkeypatch):
+    index = NgramUserSearch()
+    with SessionLocal() as db:
+        crud_user.create(db, obj_in=UserCreate(email="ada@example.com", password="Passw0rd!"))
+        index.rebuild(db)
+
+        def fail(db):
+            raise AssertionError("search reloaded the users table")
+        monkeypatch.setattr(index, "rebuild", fail)
+
+        assert index.search(db, "ada") == index.autocomplete(db, "ada")
+        assert len(index.search(db, "ada")) == 1